@@ -1,16 +1,37 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
-import mysql.connector
-from mysql.connector import Error
+import base64
+import binascii
+import hashlib
+import io
+import json
 import os
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from email_utils import send_certificate_approval_email, send_certificate_rejection_email, send_appointment_confirmation_email, send_message_reply, send_certificate_request_received_email, send_appointment_request_received_email
-from pdf_generator import generate_certificate
+from pdf_generator import CERTIFICATES_DIR, CERTIFICATES_PERSIST, certificate_filename, render_certificate, render_certificates, save_certificate
+from cache import TTLCache
+from json_provider import AppJSONProvider, http_dates
+from tracking_index import TrackingIndex, normalize_tracking_id
+from tracking_ids import insert_with_tracking_id
+from residents import get_or_create_resident
+from outbox import outbox
+import broadcast
+from slots import (
+    SlotUnavailableError, reserve as reserve_slot, available_slots, availability_range,
+    SLOT_TIMES, MAX_AVAILABILITY_DAYS
+)
+from counters import (
+    bump, status_change, certificate_status_changes, dashboard_counts,
+    CERTIFICATES_TOTAL, CERTIFICATES_PENDING, APPOINTMENTS_TOTAL, APPOINTMENTS_PENDING,
+    APPOINTMENTS_ON, MESSAGES_TOTAL, MESSAGES_UNREAD
+)
+from db import DB_CONFIG, get_db_connection, execute_query, stream_query, transaction, pool_stats, query_stats, begin_request_stats, current_request_stats
 
 app = Flask(__name__)
+app.json = AppJSONProvider(app)
 CORS(app, resources={r"/api/*": {"origins": "*", "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"], "allow_headers": ["Content-Type", "Authorization"]}})
 
 # Configuration
@@ -33,58 +54,43 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# Database Configuration
+# Environment Configuration
 from dotenv import load_dotenv
 load_dotenv()
 
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': int(os.getenv('DB_PORT', '3306')),
-    'user': os.getenv('DB_USER', 'root'),
-    'password': os.getenv('DB_PASSWORD', '010724'),
-    'database': os.getenv('DB_NAME', 'barangay_nit')
-}
-
-# Add SSL for cloud databases (like Aiven)
-if 'aivencloud.com' in DB_CONFIG['host']:
-    DB_CONFIG['ssl_disabled'] = False
-
 # Update JWT secret from environment
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 
-# Database Connection
-def get_db_connection():
-    try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        return connection
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
-        return None
-
-# Helper function to execute queries
-def execute_query(query, params=None, fetch=False):
-    connection = get_db_connection()
-    if not connection:
-        return None
-    
-    try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(query, params or ())
-        
-        if fetch:
-            result = cursor.fetchall()
-            cursor.close()
-            connection.close()
-            return result
-        else:
-            connection.commit()
-            last_id = cursor.lastrowid
-            cursor.close()
-            connection.close()
-            return last_id
-    except Error as e:
-        print(f"Error executing query: {e}")
-        return None
+# In-process caches (per worker)
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 15))  # seconds
+dashboard_cache = TTLCache(maxsize=1, ttl=DASHBOARD_CACHE_TTL)
+NEWS_CACHE_TTL = int(os.getenv('NEWS_CACHE_TTL', 300))  # seconds
+news_cache = TTLCache(maxsize=256, ttl=NEWS_CACHE_TTL)
+TRACKING_CACHE_TTL = int(os.getenv('TRACKING_CACHE_TTL', 60))  # seconds
+tracking_cache = TTLCache(maxsize=int(os.getenv('TRACKING_CACHE_SIZE', 4096)), ttl=TRACKING_CACHE_TTL)
+tracking_index = TrackingIndex()
+
+# Largest batch accepted by /api/certificates/bulk-approve
+BULK_APPROVE_LIMIT = int(os.getenv('BULK_APPROVE_LIMIT', 200))
+
+# ============================================
+# REQUEST INSTRUMENTATION
+# ============================================
+
+@app.before_request
+def start_query_counter():
+    begin_request_stats()
+
+@app.after_request
+def add_query_headers(response):
+    """In debug mode, report how many queries the request ran and the DB time they took"""
+    if app.debug:
+        stats = current_request_stats()
+        if stats is not None:
+            response.headers['X-DB-Queries'] = str(stats['queries'])
+            response.headers['X-DB-Time-Ms'] = f"{stats['timeMs']:.2f}"
+            response.headers['Server-Timing'] = f"db;desc=\"{stats['queries']} queries\";dur={stats['timeMs']:.2f}"
+    return response
 
 # ============================================
 # HEALTH CHECK & ROOT ENDPOINTS
@@ -125,7 +131,9 @@ def health():
             'host': DB_CONFIG['host'],
             'port': DB_CONFIG['port'],
             'database': DB_CONFIG['database']
-        }
+        },
+        'pool': pool_stats(),
+        'outbox': outbox.stats()
     }
     
     status_code = 200 if db_status == "connected" else 503
@@ -204,17 +212,26 @@ def create_certificate_request():
     user_id = get_jwt_identity()
     data = request.get_json()
     
-    tracking_id = generate_tracking_id('CERT')
-    
-    cert_id = execute_query(
-        """INSERT INTO certificate_requests 
-           (user_id, tracking_id, certificate_type, purpose, status, date_needed)
-           VALUES (%s, %s, %s, %s, 'pending', %s)""",
-        (user_id, tracking_id, data['certificateType'], 
-         data['purpose'], data.get('dateNeeded'))
-    )
-    
+    def insert(tx, tracking_id):
+        cert_id = tx.execute(
+            """INSERT INTO certificate_requests
+               (user_id, tracking_id, certificate_type, purpose, status, date_needed)
+               VALUES (%s, %s, %s, %s, 'pending', %s)""",
+            (user_id, tracking_id, data['certificateType'],
+             data['purpose'], data.get('dateNeeded'))
+        )
+        bump(tx, (CERTIFICATES_TOTAL, 1), (CERTIFICATES_PENDING, 1))
+        return cert_id
+
+    try:
+        tracking_id, cert_id = insert_with_tracking_id('CERT', insert)
+    except Exception as e:
+        print(f"Error creating certificate request: {e}")
+        cert_id = None
+
     if cert_id:
+        invalidate_dashboard_stats()
+        tracking_index.add(tracking_id)
         return jsonify({
             'message': 'Certificate request submitted successfully',
             'trackingId': tracking_id,
@@ -225,28 +242,64 @@ def create_certificate_request():
 @app.route('/api/certificates/all', methods=['GET'])
 @jwt_required()
 def get_all_certificates():
+    """Get certificate requests for admin dashboard, newest first, one page at a time (optional ?status=)"""
+    try:
+        limit, cursor = get_page_params(2)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
+
+    conditions, params = status_filter('cr.status')
+    if cursor:
+        created_at, last_id = cursor
+        conditions.append("cr.created_at < %s OR (cr.created_at = %s AND cr.id < %s)")
+        params += [created_at, created_at, last_id]
+    where = where_clause(conditions)
+
     certificates = execute_query(
-        """SELECT cr.*, u.first_name, u.last_name, u.email, u.phone
+        f"""SELECT cr.*, u.first_name, u.last_name, u.email, u.phone
            FROM certificate_requests cr
            JOIN users u ON cr.user_id = u.id
-           ORDER BY cr.created_at DESC""",
+           {where}
+           ORDER BY cr.created_at DESC, cr.id DESC
+           LIMIT %s""",
+        (*params, limit + 1),
         fetch=True
     )
-    
-    # Convert dates to strings for JSON serialization
-    if certificates:
-        for cert in certificates:
-            if 'created_at' in cert and cert['created_at'] is not None:
-                cert['created_at'] = cert['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-            if 'processed_at' in cert and cert['processed_at'] is not None:
-                cert['processed_at'] = cert['processed_at'].strftime('%Y-%m-%d %H:%M:%S')
-            if 'date_needed' in cert and cert['date_needed'] is not None:
-                cert['date_needed'] = cert['date_needed'].strftime('%Y-%m-%d')
-    
-    return jsonify(certificates), 200
+
+    if certificates is None:
+        return jsonify({'message': 'Failed to load certificate requests'}), 500
+
+    certificates, next_cursor = keyset_page(certificates, limit, ('created_at', 'id'))
+
+    return jsonify({'items': certificates, 'nextCursor': next_cursor}), 200
+
+@app.route('/api/certificates/export', methods=['GET'])
+@jwt_required()
+def export_certificates():
+    """Stream every certificate request as a JSON array (default) or NDJSON (?format=ndjson)"""
+    try:
+        rows = stream_query(
+            """SELECT cr.*, u.first_name, u.last_name, u.email, u.phone
+               FROM certificate_requests cr
+               JOIN users u ON cr.user_id = u.id
+               ORDER BY cr.created_at DESC, cr.id DESC"""
+        )
+    except Exception as e:
+        print(f"Error exporting certificates: {e}")
+        return jsonify({'message': 'Failed to export certificate requests'}), 500
+
+    return stream_json_response(rows, request.args.get('format'))
 
 @app.route('/api/certificates/track/<tracking_id>', methods=['GET'])
 def track_certificate(tracking_id):
+    tracking_id = normalize_tracking_id(tracking_id)
+    payload = tracking_cache.get(('certificate', tracking_id))
+    if payload is not None:
+        return jsonify(payload), 200
+
+    if not tracking_index.might_exist(tracking_id):
+        return jsonify({'message': 'Certificate not found'}), 404
+
     result = execute_query(
         """SELECT cr.*, u.first_name, u.last_name, u.email
            FROM certificate_requests cr
@@ -257,10 +310,12 @@ def track_certificate(tracking_id):
     )
     
     if not result:
+        if result is not None:
+            tracking_index.remember_missing(tracking_id)
         return jsonify({'message': 'Certificate not found'}), 404
     
     cert = result[0]
-    return jsonify({
+    payload = {
         'id': cert['tracking_id'],
         'type': cert['certificate_type'],
         'name': f"{cert['first_name']} {cert['last_name']}",
@@ -268,7 +323,9 @@ def track_certificate(tracking_id):
         'status': cert['status'],
         'dateProcessed': cert['processed_at'].strftime('%Y-%m-%d') if cert['processed_at'] else None,
         'remarks': cert['remarks'] or 'Under review'
-    }), 200
+    }
+    tracking_cache.set(('certificate', tracking_id), payload)
+    return jsonify(payload), 200
 
 @app.route('/api/certificates/user', methods=['GET'])
 @jwt_required()
@@ -283,119 +340,269 @@ def get_user_certificates():
         fetch=True
     )
     
-    return jsonify(certificates), 200
+    return jsonify(http_dates(certificates)), 200
+
+def certificate_pdf_data(cert, issued_at):
+    """
+    render_certificate data for a certificate row (joined with the user's name)
+
+    Approval, bulk approval and the download endpoint all build their PDFs
+    here, so a re-rendered download matches the copy that was emailed. The
+    address is not stored, so every path uses the layout's default.
+    """
+    return {
+        'name': f"{cert['first_name']} {cert['last_name']}",
+        'purpose': cert['purpose'],
+        'tracking_id': cert['tracking_id'],
+        'issued_at': issued_at
+    }
 
 @app.route('/api/certificates/<int:cert_id>/approve', methods=['POST'])
 @jwt_required()
 def approve_certificate(cert_id):
     """Approve certificate and send email with PDF"""
     data = request.get_json()
-    
-    # Get certificate details
-    cert = execute_query(
-        """SELECT cr.*, u.first_name, u.last_name, u.email
-           FROM certificate_requests cr
-           JOIN users u ON cr.user_id = u.id
-           WHERE cr.id = %s""",
-        (cert_id,),
-        fetch=True
-    )
-    
-    if not cert:
-        return jsonify({'message': 'Certificate not found'}), 404
-    
-    cert_data = cert[0]
-    
+
     try:
-        # Update status to approved
-        execute_query(
-            """UPDATE certificate_requests 
-               SET status = 'approved', remarks = %s, processed_at = NOW()
-               WHERE id = %s""",
-            (data.get('remarks', 'Certificate approved'), cert_id)
-        )
-        
+        with transaction() as tx:
+            # Get certificate details
+            cert = tx.execute(
+                """SELECT cr.*, u.first_name, u.last_name, u.email
+                   FROM certificate_requests cr
+                   JOIN users u ON cr.user_id = u.id
+                   WHERE cr.id = %s
+                   FOR UPDATE""",
+                (cert_id,),
+                fetch=True
+            )
+
+            if not cert:
+                return jsonify({'message': 'Certificate not found'}), 404
+
+            cert_data = cert[0]
+
+            # Update status to approved; the PDF's issue date is this processed_at
+            processed_at = datetime.now().replace(microsecond=0)
+            tx.execute(
+                """UPDATE certificate_requests
+                   SET status = 'approved', remarks = %s, processed_at = %s
+                   WHERE id = %s""",
+                (data.get('remarks', 'Certificate approved'), processed_at, cert_id)
+            )
+            bump(tx, *certificate_status_changes(cert_data['status'], 'approved'))
+        invalidate_dashboard_stats()
+        invalidate_tracking('certificate', cert_data['tracking_id'])
+
         # Generate PDF certificate
         full_name = f"{cert_data['first_name']} {cert_data['last_name']}"
-        pdf_data = {
-            'name': full_name,
-            'purpose': cert_data['purpose'],
-            'tracking_id': cert_data['tracking_id'],
-            'address': data.get('address', 'Barangay NIT, Accenture Campus')
-        }
-        
-        pdf_path = generate_certificate(cert_data['certificate_type'], pdf_data)
+        pdf = render_certificate(cert_data['certificate_type'], certificate_pdf_data(cert_data, processed_at))
+        pdf_path = save_certificate(*pdf) if CERTIFICATES_PERSIST else None
         
-        # Send email with PDF attachment
-        email_sent = send_certificate_approval_email(
+        # Queue email with the PDF attached straight from memory
+        email_job = outbox.submit(
+            send_certificate_approval_email,
+            kind='certificate_approval',
             recipient_email=cert_data['email'],
             recipient_name=full_name,
             certificate_type=cert_data['certificate_type'],
             tracking_id=cert_data['tracking_id'],
-            pdf_path=pdf_path
+            pdf=pdf
         )
-        
-        if email_sent:
-            return jsonify({
-                'message': 'Certificate approved and email sent successfully',
-                'pdfPath': pdf_path
-            }), 200
-        else:
-            return jsonify({
-                'message': 'Certificate approved but email failed to send',
-                'pdfPath': pdf_path
-            }), 200
-            
+
+        return jsonify({
+            'message': 'Certificate approved; email queued for delivery',
+            'pdfPath': pdf_path,
+            'downloadUrl': f'/api/certificates/{cert_id}/pdf',
+            'emailJob': email_job
+        }), 200
+
+
     except Exception as e:
         print(f"Error approving certificate: {e}")
         return jsonify({'message': f'Error: {str(e)}'}), 500
 
+@app.route('/api/certificates/bulk-approve', methods=['POST'])
+@jwt_required()
+def bulk_approve_certificates():
+    """
+    Approve many certificates at once
+
+    Body: {"ids": [1, 2, ...], "remarks": "..."}
+    PDFs are rendered in parallel worker processes first; only certificates
+    whose PDF rendered are approved (in one UPDATE) and get an email on the
+    outbox. Failed renders stay unapproved and are listed in failedIds, so
+    the same request can be retried. Certificates that are already approved
+    are skipped, so a retried batch sends no duplicates.
+    """
+    data = request.get_json() or {}
+    ids = data.get('ids')
+
+    # bool is a subclass of int; true/false are not certificate ids
+    if not isinstance(ids, list) or not ids or \
+            not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        return jsonify({'message': 'ids must be a non-empty list of certificate ids'}), 400
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > BULK_APPROVE_LIMIT:
+        return jsonify({'message': f'At most {BULK_APPROVE_LIMIT} certificates per request'}), 400
+
+    try:
+        placeholders = ', '.join(['%s'] * len(ids))
+        select_certs = f"""SELECT cr.*, u.first_name, u.last_name, u.email
+                           FROM certificate_requests cr
+                           JOIN users u ON cr.user_id = u.id
+                           WHERE cr.id IN ({placeholders})"""
+        certs = execute_query(select_certs, ids, fetch=True)
+        if certs is None:
+            return jsonify({'message': 'Failed to load certificates'}), 500
+        pending = [cert for cert in certs if cert['status'] != 'approved']
+
+        # Render every PDF in parallel before anything is approved; the PDFs carry the approval time
+        processed_at = datetime.now().replace(microsecond=0)
+        pdfs = render_certificates([
+            (cert['certificate_type'], certificate_pdf_data(cert, processed_at)) for cert in pending
+        ])
+
+        results = {}
+        rendered = {}
+        for cert, (pdf, error) in zip(pending, pdfs):
+            if error:
+                print(f"Error generating certificate {cert['tracking_id']}: {error}")
+                results[cert['id']] = {'id': cert['id'], 'trackingId': cert['tracking_id'], 'status': 'failed',
+                                       'error': f'PDF generation failed: {error}'}
+            else:
+                rendered[cert['id']] = pdf
+
+        to_approve = []
+        if rendered:
+            with transaction() as tx:
+                # Re-read under lock: another request may have approved some of these meanwhile
+                locked = tx.execute(
+                    f"""SELECT id, status FROM certificate_requests
+                        WHERE id IN ({', '.join(['%s'] * len(rendered))})
+                        FOR UPDATE""",
+                    list(rendered),
+                    fetch=True
+                )
+                statuses = {row['id']: row['status'] for row in locked}
+                to_approve = [cert for cert in pending
+                              if cert['id'] in rendered and statuses.get(cert['id'], 'approved') != 'approved']
+
+                if to_approve:
+                    tx.execute(
+                        f"""UPDATE certificate_requests
+                            SET status = 'approved', remarks = %s, processed_at = %s
+                            WHERE id IN ({', '.join(['%s'] * len(to_approve))})""",
+                        [data.get('remarks', 'Certificate approved'), processed_at] +
+                        [cert['id'] for cert in to_approve]
+                    )
+                    changes = {}
+                    for cert in to_approve:
+                        for name, delta in certificate_status_changes(statuses[cert['id']], 'approved'):
+                            changes[name] = changes.get(name, 0) + delta
+                    bump(tx, *changes.items())
+
+        if to_approve:
+            invalidate_dashboard_stats()
+        for cert in to_approve:
+            invalidate_tracking('certificate', cert['tracking_id'])
+
+        # Keep and send only what was committed
+        for cert in to_approve:
+            pdf = rendered[cert['id']]
+            results[cert['id']] = {
+                'id': cert['id'],
+                'trackingId': cert['tracking_id'],
+                'status': 'approved',
+                'downloadUrl': f"/api/certificates/{cert['id']}/pdf",
+                'pdfPath': save_certificate(*pdf) if CERTIFICATES_PERSIST else None,
+                'emailJob': outbox.submit(
+                    send_certificate_approval_email,
+                    kind='certificate_approval',
+                    recipient_email=cert['email'],
+                    recipient_name=f"{cert['first_name']} {cert['last_name']}",
+                    certificate_type=cert['certificate_type'],
+                    tracking_id=cert['tracking_id'],
+                    pdf=pdf
+                )
+            }
+
+        for cert in certs:
+            if cert['id'] not in results:
+                results[cert['id']] = {'id': cert['id'], 'trackingId': cert['tracking_id'], 'status': 'skipped',
+                                       'error': 'Already approved'}
+
+        items = [results.get(cert_id) or {'id': cert_id, 'status': 'not_found', 'error': 'Certificate not found'}
+                 for cert_id in ids]
+        failed_ids = [item['id'] for item in items if item['status'] == 'failed']
+        return jsonify({
+            'message': f'{len(to_approve)} certificates approved; emails queued for delivery',
+            'approved': len(to_approve),
+            'skipped': len(certs) - len(to_approve) - len(failed_ids),
+            'failed': len(failed_ids),
+            'failedIds': failed_ids,
+            'notFound': len(ids) - len(certs),
+            'results': items
+        }), 200
+
+    except Exception as e:
+        print(f"Error bulk approving certificates: {e}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
 @app.route('/api/certificates/<int:cert_id>/reject', methods=['POST'])
 @jwt_required()
 def reject_certificate(cert_id):
     """Reject certificate and send email notification"""
     data = request.get_json()
-    
-    # Get certificate details
-    cert = execute_query(
-        """SELECT cr.*, u.first_name, u.last_name, u.email
-           FROM certificate_requests cr
-           JOIN users u ON cr.user_id = u.id
-           WHERE cr.id = %s""",
-        (cert_id,),
-        fetch=True
-    )
-    
-    if not cert:
-        return jsonify({'message': 'Certificate not found'}), 404
-    
-    cert_data = cert[0]
-    
+
     try:
-        # Update status to rejected
         reason = data.get('reason', 'Please contact the barangay office for more information')
-        execute_query(
-            """UPDATE certificate_requests 
-               SET status = 'rejected', remarks = %s, processed_at = NOW()
-               WHERE id = %s""",
-            (reason, cert_id)
-        )
+
+        with transaction() as tx:
+            # Get certificate details
+            cert = tx.execute(
+                """SELECT cr.*, u.first_name, u.last_name, u.email
+                   FROM certificate_requests cr
+                   JOIN users u ON cr.user_id = u.id
+                   WHERE cr.id = %s
+                   FOR UPDATE""",
+                (cert_id,),
+                fetch=True
+            )
+
+            if not cert:
+                return jsonify({'message': 'Certificate not found'}), 404
+
+            cert_data = cert[0]
+
+            # Update status to rejected
+            tx.execute(
+                """UPDATE certificate_requests
+                   SET status = 'rejected', remarks = %s, processed_at = NOW()
+                   WHERE id = %s""",
+                (reason, cert_id)
+            )
+            bump(tx, *certificate_status_changes(cert_data['status'], 'rejected'))
+        invalidate_dashboard_stats()
+        invalidate_tracking('certificate', cert_data['tracking_id'])
         
-        # Send rejection email
+        # Queue rejection email
         full_name = f"{cert_data['first_name']} {cert_data['last_name']}"
-        email_sent = send_certificate_rejection_email(
+        email_job = outbox.submit(
+            send_certificate_rejection_email,
+            kind='certificate_rejection',
             recipient_email=cert_data['email'],
             recipient_name=full_name,
             certificate_type=cert_data['certificate_type'],
             tracking_id=cert_data['tracking_id'],
             reason=reason
         )
-        
-        if email_sent:
-            return jsonify({'message': 'Certificate rejected and email sent successfully'}), 200
-        else:
-            return jsonify({'message': 'Certificate rejected but email failed to send'}), 200
-            
+
+        return jsonify({
+            'message': 'Certificate rejected; email queued for delivery',
+            'emailJob': email_job
+        }), 200
+
+
     except Exception as e:
         print(f"Error rejecting certificate: {e}")
         return jsonify({'message': f'Error: {str(e)}'}), 500
@@ -404,14 +611,31 @@ def reject_certificate(cert_id):
 @jwt_required()
 def update_certificate_status(cert_id):
     data = request.get_json()
-    
-    execute_query(
-        """UPDATE certificate_requests 
-           SET status = %s, remarks = %s, processed_at = NOW()
-           WHERE id = %s""",
-        (data['status'], data.get('remarks', ''), cert_id)
-    )
-    
+
+    try:
+        with transaction() as tx:
+            cert = tx.execute(
+                "SELECT status, tracking_id FROM certificate_requests WHERE id = %s FOR UPDATE",
+                (cert_id,),
+                fetch=True
+            )
+
+            if not cert:
+                return jsonify({'message': 'Certificate not found'}), 404
+
+            tx.execute(
+                """UPDATE certificate_requests
+                   SET status = %s, remarks = %s, processed_at = NOW()
+                   WHERE id = %s""",
+                (data['status'], data.get('remarks', ''), cert_id)
+            )
+            bump(tx, *certificate_status_changes(cert[0]['status'], data['status']))
+    except Exception as e:
+        print(f"Error updating certificate status: {e}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+    invalidate_dashboard_stats()
+    invalidate_tracking('certificate', cert[0]['tracking_id'])
+
     return jsonify({'message': 'Certificate status updated'}), 200
 
 # PUBLIC CERTIFICATE REQUEST (No login required)
@@ -445,53 +669,38 @@ def create_public_certificate_request():
                 file.save(file_path)
                 id_file_path = file_path
         
-        tracking_id = generate_tracking_id('CERT')
-        
-        # Create or get user by email
-        user = execute_query(
-            "SELECT id FROM users WHERE email = %s",
-            (email,),
-            fetch=True
-        )
-        
-        if user:
-            user_id = user[0]['id']
-        else:
-            # Create new user for public request
-            name_parts = name.split()
-            first_name = name_parts[0]
-            last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
-            
-            user_id = execute_query(
-                """INSERT INTO users (email, first_name, last_name, phone, role)
-                   VALUES (%s, %s, %s, %s, 'resident')""",
-                (email, first_name, last_name, phone)
+        # User lookup/creation and the request insert commit together
+        def insert(tx, tracking_id):
+            user_id = get_or_create_resident(tx, email, name, phone)
+
+            # Insert certificate request with ID info, file path, and fee info
+            cert_id = tx.execute(
+                """INSERT INTO certificate_requests
+                   (user_id, tracking_id, certificate_type, purpose, status, date_needed,
+                    id_type, id_number, id_file_path, request_type, fee_amount)
+                   VALUES (%s, %s, %s, %s, 'pending', %s, %s, %s, %s, 'online', 0.00)""",
+                (user_id, tracking_id, certificate_type, purpose, date_needed,
+                 id_type, id_number, id_file_path)
             )
-        
-        # Insert certificate request with ID info, file path, and fee info
-        cert_id = execute_query(
-            """INSERT INTO certificate_requests 
-               (user_id, tracking_id, certificate_type, purpose, status, date_needed, 
-                id_type, id_number, id_file_path, request_type, fee_amount)
-               VALUES (%s, %s, %s, %s, 'pending', %s, %s, %s, %s, 'online', 0.00)""",
-            (user_id, tracking_id, certificate_type, purpose, date_needed,
-             id_type, id_number, id_file_path)
-        )
-        
+            bump(tx, (CERTIFICATES_TOTAL, 1), (CERTIFICATES_PENDING, 1))
+            return cert_id
+
+        tracking_id, cert_id = insert_with_tracking_id('CERT', insert)
+
         if cert_id:
-            # Send confirmation email
-            try:
-                send_certificate_request_received_email(
-                    recipient_email=email,
-                    recipient_name=name,
-                    certificate_type=certificate_type,
-                    tracking_id=tracking_id
-                )
-                print(f"Confirmation email sent to {email}")
-            except Exception as e:
-                print(f"Error sending confirmation email: {e}")
-                # Don't fail the request if email fails
-            
+            invalidate_dashboard_stats()
+            tracking_index.add(tracking_id)
+
+            # Queue confirmation email; delivery never fails the request
+            outbox.submit(
+                send_certificate_request_received_email,
+                kind='certificate_received',
+                recipient_email=email,
+                recipient_name=name,
+                certificate_type=certificate_type,
+                tracking_id=tracking_id
+            )
+
             return jsonify({
                 'message': 'Certificate request submitted successfully',
                 'trackingId': tracking_id,
@@ -513,18 +722,31 @@ def create_appointment():
     user_id = get_jwt_identity()
     data = request.get_json()
     
-    tracking_id = generate_tracking_id('APPT')
-    
-    appt_id = execute_query(
-        """INSERT INTO appointments 
-           (user_id, tracking_id, service_type, appointment_date, 
-            appointment_time, health_concern, status)
-           VALUES (%s, %s, %s, %s, %s, %s, 'pending')""",
-        (user_id, tracking_id, data['serviceType'], data['date'],
-         data['time'], data.get('healthConcern', ''))
-    )
-    
+    def insert(tx, tracking_id):
+        # Take the slot first so a full slot fails before anything is written
+        reserve_slot(tx, data['serviceType'], data['date'], data['time'])
+        appt_id = tx.execute(
+            """INSERT INTO appointments
+               (user_id, tracking_id, service_type, appointment_date,
+                appointment_time, health_concern, status)
+               VALUES (%s, %s, %s, %s, %s, %s, 'pending')""",
+            (user_id, tracking_id, data['serviceType'], data['date'],
+             data['time'], data.get('healthConcern', ''))
+        )
+        bump(tx, (APPOINTMENTS_TOTAL, 1), (APPOINTMENTS_PENDING, 1), (APPOINTMENTS_ON, 1, data['date']))
+        return appt_id
+
+    try:
+        tracking_id, appt_id = insert_with_tracking_id('APPT', insert)
+    except SlotUnavailableError as e:
+        return jsonify({'message': f'Time slot unavailable: {e}'}), 409
+    except Exception as e:
+        print(f"Error creating appointment: {e}")
+        appt_id = None
+
     if appt_id:
+        invalidate_dashboard_stats()
+        tracking_index.add(tracking_id)
         return jsonify({
             'message': 'Appointment booked successfully',
             'trackingId': tracking_id,
@@ -536,33 +758,40 @@ def create_appointment():
 @jwt_required()
 def confirm_appointment(appt_id):
     """Confirm appointment and send email"""
-    # Get appointment details
-    appt = execute_query(
-        """SELECT a.*, u.first_name, u.last_name, u.email
-           FROM appointments a
-           JOIN users u ON a.user_id = u.id
-           WHERE a.id = %s""",
-        (appt_id,),
-        fetch=True
-    )
-    
-    if not appt:
-        return jsonify({'message': 'Appointment not found'}), 404
-    
-    appt_data = appt[0]
-    
     try:
-        # Update status to confirmed
-        execute_query(
-            """UPDATE appointments 
-               SET status = 'confirmed', remarks = 'Appointment confirmed'
-               WHERE id = %s""",
-            (appt_id,)
-        )
+        with transaction() as tx:
+            # Get appointment details
+            appt = tx.execute(
+                """SELECT a.*, u.first_name, u.last_name, u.email
+                   FROM appointments a
+                   JOIN users u ON a.user_id = u.id
+                   WHERE a.id = %s
+                   FOR UPDATE""",
+                (appt_id,),
+                fetch=True
+            )
+
+            if not appt:
+                return jsonify({'message': 'Appointment not found'}), 404
+
+            appt_data = appt[0]
+
+            # Update status to confirmed
+            tx.execute(
+                """UPDATE appointments
+                   SET status = 'confirmed', remarks = 'Appointment confirmed'
+                   WHERE id = %s""",
+                (appt_id,)
+            )
+            bump(tx, status_change(APPOINTMENTS_PENDING, appt_data['status'], 'confirmed', 'pending'))
+        invalidate_dashboard_stats()
+        invalidate_tracking('appointment', appt_data['tracking_id'])
         
-        # Send confirmation email
+        # Queue confirmation email
         full_name = f"{appt_data['first_name']} {appt_data['last_name']}"
-        email_sent = send_appointment_confirmation_email(
+        email_job = outbox.submit(
+            send_appointment_confirmation_email,
+            kind='appointment_confirmation',
             recipient_email=appt_data['email'],
             recipient_name=full_name,
             service_type=appt_data['service_type'],
@@ -570,12 +799,13 @@ def confirm_appointment(appt_id):
             time=str(appt_data['appointment_time']),
             tracking_id=appt_data['tracking_id']
         )
-        
-        if email_sent:
-            return jsonify({'message': 'Appointment confirmed and email sent successfully'}), 200
-        else:
-            return jsonify({'message': 'Appointment confirmed but email failed to send'}), 200
-            
+
+        return jsonify({
+            'message': 'Appointment confirmed; email queued for delivery',
+            'emailJob': email_job
+        }), 200
+
+
     except Exception as e:
         print(f"Error confirming appointment: {e}")
         return jsonify({'message': f'Error: {str(e)}'}), 500
@@ -583,36 +813,68 @@ def confirm_appointment(appt_id):
 @app.route('/api/appointments/all', methods=['GET'])
 @jwt_required()
 def get_all_appointments():
-    """Get all appointments for admin dashboard"""
+    """Get appointments for admin dashboard, latest slot first, one page at a time (optional ?status=)"""
+    try:
+        limit, cursor = get_page_params(3)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
+
+    conditions, params = status_filter('a.status')
+    if cursor:
+        appointment_date, appointment_time, last_id = cursor
+        conditions.append("""a.appointment_date < %s
+                 OR (a.appointment_date = %s AND (a.appointment_time < %s
+                     OR (a.appointment_time = %s AND a.id < %s)))""")
+        params += [appointment_date, appointment_date, appointment_time, appointment_time, last_id]
+    where = where_clause(conditions)
+
     appointments = execute_query(
-        """SELECT a.*, u.first_name, u.last_name, u.email, u.phone
+        f"""SELECT a.*, u.first_name, u.last_name, u.email, u.phone
            FROM appointments a
            JOIN users u ON a.user_id = u.id
-           ORDER BY a.appointment_date DESC, a.appointment_time DESC""",
+           {where}
+           ORDER BY a.appointment_date DESC, a.appointment_time DESC, a.id DESC
+           LIMIT %s""",
+        (*params, limit + 1),
         fetch=True
     )
-    
-    # Convert timedelta to string for JSON serialization
-    if appointments:
-        for appt in appointments:
-            if 'appointment_time' in appt and appt['appointment_time'] is not None:
-                # Convert timedelta to string format HH:MM:SS
-                total_seconds = int(appt['appointment_time'].total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                seconds = total_seconds % 60
-                appt['appointment_time'] = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
-            # Convert dates to string
-            if 'appointment_date' in appt and appt['appointment_date'] is not None:
-                appt['appointment_date'] = appt['appointment_date'].strftime('%Y-%m-%d')
-            if 'created_at' in appt and appt['created_at'] is not None:
-                appt['created_at'] = appt['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-    
-    return jsonify(appointments), 200
+
+    if appointments is None:
+        return jsonify({'message': 'Failed to load appointments'}), 500
+
+    appointments, next_cursor = keyset_page(
+        appointments, limit, ('appointment_date', 'appointment_time', 'id')
+    )
+
+    return jsonify({'items': appointments, 'nextCursor': next_cursor}), 200
+
+@app.route('/api/appointments/export', methods=['GET'])
+@jwt_required()
+def export_appointments():
+    """Stream every appointment as a JSON array (default) or NDJSON (?format=ndjson)"""
+    try:
+        rows = stream_query(
+            """SELECT a.*, u.first_name, u.last_name, u.email, u.phone
+               FROM appointments a
+               JOIN users u ON a.user_id = u.id
+               ORDER BY a.appointment_date DESC, a.appointment_time DESC, a.id DESC"""
+        )
+    except Exception as e:
+        print(f"Error exporting appointments: {e}")
+        return jsonify({'message': 'Failed to export appointments'}), 500
+
+    return stream_json_response(rows, request.args.get('format'))
 
 @app.route('/api/appointments/track/<tracking_id>', methods=['GET'])
 def track_appointment(tracking_id):
+    tracking_id = normalize_tracking_id(tracking_id)
+    payload = tracking_cache.get(('appointment', tracking_id))
+    if payload is not None:
+        return jsonify(payload), 200
+
+    if not tracking_index.might_exist(tracking_id):
+        return jsonify({'message': 'Appointment not found'}), 404
+
     result = execute_query(
         """SELECT a.*, u.first_name, u.last_name
            FROM appointments a
@@ -623,10 +885,12 @@ def track_appointment(tracking_id):
     )
     
     if not result:
+        if result is not None:
+            tracking_index.remember_missing(tracking_id)
         return jsonify({'message': 'Appointment not found'}), 404
     
     appt = result[0]
-    return jsonify({
+    payload = {
         'id': appt['tracking_id'],
         'service': appt['service_type'],
         'name': f"{appt['first_name']} {appt['last_name']}",
@@ -634,7 +898,9 @@ def track_appointment(tracking_id):
         'time': str(appt['appointment_time']),
         'status': appt['status'],
         'remarks': appt['remarks'] or 'Awaiting confirmation'
-    }), 200
+    }
+    tracking_cache.set(('appointment', tracking_id), payload)
+    return jsonify(payload), 200
 
 # PUBLIC APPOINTMENT BOOKING (No login required)
 @app.route('/api/appointments/public', methods=['POST'])
@@ -647,62 +913,52 @@ def create_public_appointment():
                    data.get('serviceType'), data.get('date'), data.get('time')]):
             return jsonify({'message': 'Missing required fields'}), 400
         
-        tracking_id = generate_tracking_id('APPT')
-        
-        # Create or get user by email
-        user = execute_query(
-            "SELECT id FROM users WHERE email = %s",
-            (data['email'],),
-            fetch=True
-        )
-        
-        if user:
-            user_id = user[0]['id']
-        else:
-            # Create new user for public request
-            name_parts = data['name'].split()
-            first_name = name_parts[0]
-            last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
-            
-            user_id = execute_query(
-                """INSERT INTO users (email, first_name, last_name, phone, role)
-                   VALUES (%s, %s, %s, %s, 'resident')""",
-                (data['email'], first_name, last_name, data.get('phone', ''))
+        # User lookup/creation and the appointment insert commit together
+        def insert(tx, tracking_id):
+            user_id = get_or_create_resident(tx, data['email'], data['name'], data.get('phone', ''))
+
+            # Take the slot; raises SlotUnavailableError (and rolls back) when it is full
+            reserve_slot(tx, data['serviceType'], data['date'], data['time'])
+
+            # Insert appointment
+            appt_id = tx.execute(
+                """INSERT INTO appointments
+                   (user_id, tracking_id, service_type, appointment_date,
+                    appointment_time, health_concern, status)
+                   VALUES (%s, %s, %s, %s, %s, %s, 'pending')""",
+                (user_id, tracking_id, data['serviceType'], data['date'],
+                 data['time'], data.get('healthConcern', ''))
             )
-        
-        # Insert appointment
-        appt_id = execute_query(
-            """INSERT INTO appointments 
-               (user_id, tracking_id, service_type, appointment_date, 
-                appointment_time, health_concern, status)
-               VALUES (%s, %s, %s, %s, %s, %s, 'pending')""",
-            (user_id, tracking_id, data['serviceType'], data['date'],
-             data['time'], data.get('healthConcern', ''))
-        )
-        
+            bump(tx, (APPOINTMENTS_TOTAL, 1), (APPOINTMENTS_PENDING, 1), (APPOINTMENTS_ON, 1, data['date']))
+            return appt_id
+
+        tracking_id, appt_id = insert_with_tracking_id('APPT', insert)
+
         if appt_id:
-            # Send confirmation email
-            try:
-                send_appointment_request_received_email(
-                    recipient_email=data['email'],
-                    recipient_name=data['name'],
-                    service_type=data['serviceType'],
-                    date=data['date'],
-                    time=data['time'],
-                    tracking_id=tracking_id
-                )
-                print(f"Appointment confirmation email sent to {data['email']}")
-            except Exception as e:
-                print(f"Error sending confirmation email: {e}")
-                # Don't fail the request if email fails
-            
+            invalidate_dashboard_stats()
+            tracking_index.add(tracking_id)
+
+            # Queue confirmation email; delivery never fails the request
+            outbox.submit(
+                send_appointment_request_received_email,
+                kind='appointment_received',
+                recipient_email=data['email'],
+                recipient_name=data['name'],
+                service_type=data['serviceType'],
+                date=data['date'],
+                time=data['time'],
+                tracking_id=tracking_id
+            )
+
             return jsonify({
                 'message': 'Appointment booked successfully',
                 'trackingId': tracking_id,
                 'appointmentId': appt_id
             }), 201
         return jsonify({'message': 'Failed to book appointment'}), 500
-        
+
+    except SlotUnavailableError as e:
+        return jsonify({'message': f'Time slot unavailable: {e}'}), 409
     except Exception as e:
         print(f"Error in create_public_appointment: {e}")
         import traceback
@@ -713,73 +969,117 @@ def create_public_appointment():
 def get_available_slots():
     date = request.args.get('date')
     service = request.args.get('service')
-    
-    # Maximum appointments per time slot per service
-    MAX_APPOINTMENTS_PER_SLOT = 3
-    
-    # Get booked slots with count
-    booked = execute_query(
-        """SELECT appointment_time, COUNT(*) as count 
-           FROM appointments 
-           WHERE appointment_date = %s AND service_type = %s 
-           AND status != 'cancelled'
-           GROUP BY appointment_time""",
-        (date, service),
-        fetch=True
-    )
-    
-    # Create dictionary of booked times with their counts
-    booked_counts = {str(slot['appointment_time']): slot['count'] for slot in booked}
-    
-    # Generate all possible slots (9 AM to 4 PM)
-    all_slots = []
-    for hour in range(9, 17):
-        all_slots.append(f"{hour:02d}:00:00")
-        all_slots.append(f"{hour:02d}:30:00")
-    
-    # Filter slots - only include if less than MAX_APPOINTMENTS_PER_SLOT bookings
-    available = [slot for slot in all_slots if booked_counts.get(slot, 0) < MAX_APPOINTMENTS_PER_SLOT]
-    
+
+    available = available_slots(service, date)
+    if available is None:
+        return jsonify({'message': 'Failed to load available slots'}), 500
+
     return jsonify({'availableSlots': available}), 200
 
+@app.route('/api/appointments/availability', methods=['GET'])
+def get_availability():
+    """Per-day slot availability for a service over a date range (?from=&to=&service=)"""
+    service = request.args.get('service')
+    if not service:
+        return jsonify({'message': 'service is required'}), 400
+
+    try:
+        start = datetime.strptime(request.args.get('from') or datetime.now().strftime('%Y-%m-%d'), '%Y-%m-%d').date()
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') \
+            else start + timedelta(days=30)
+    except ValueError:
+        return jsonify({'message': 'from and to must be dates in YYYY-MM-DD format'}), 400
+
+    if end < start or (end - start).days >= MAX_AVAILABILITY_DAYS:
+        return jsonify({'message': f'Date range must be 1 to {MAX_AVAILABILITY_DAYS} days'}), 400
+
+    days = availability_range(service, start, end)
+    if days is None:
+        return jsonify({'message': 'Failed to load availability'}), 500
+
+    return jsonify({
+        'service': service,
+        'from': start,
+        'to': end,
+        'slotTimes': SLOT_TIMES,
+        'days': days
+    }), 200
+
 # ============================================
 # NEWS & ANNOUNCEMENTS ENDPOINTS
 # ============================================
 
+def news_response(cache_key, load):
+    """
+    Serve a public news payload from news_cache with a strong ETag
+
+    load() runs only on a cache miss and returns the data to encode, or a
+    (body, status) error response which is returned as-is and not cached.
+    A matching If-None-Match gets a 304 with no body.
+    """
+    entry = news_cache.get(cache_key)
+    if entry is None:
+        data = load()
+        if isinstance(data, tuple):
+            return data
+        body = app.json.dumps(data).encode()
+        entry = (body, hashlib.sha1(body).hexdigest())
+        news_cache.set(cache_key, entry)
+
+    body, etag = entry
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Browsers keep the copy but revalidate it on every visit
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response.make_conditional(request)
+
+def invalidate_news_cache():
+    """Drop every cached news payload after an article is created, updated or deleted"""
+    news_cache.clear()
+
 @app.route('/api/news', methods=['GET'])
 def get_news():
     category = request.args.get('category')
-    
-    if category and category != 'all':
-        news = execute_query(
-            """SELECT * FROM news_articles 
-               WHERE category = %s AND published = TRUE
-               ORDER BY created_at DESC""",
-            (category,),
-            fetch=True
-        )
-    else:
+    if not category or category == 'all':
+        category = None
+
+    def load():
+        if category:
+            news = execute_query(
+                """SELECT * FROM news_articles
+                   WHERE category = %s AND published = TRUE
+                   ORDER BY created_at DESC""",
+                (category,),
+                fetch=True
+            )
+        else:
+            news = execute_query(
+                """SELECT * FROM news_articles
+                   WHERE published = TRUE
+                   ORDER BY created_at DESC""",
+                fetch=True
+            )
+
+        if news is None:
+            return jsonify({'message': 'Failed to load news'}), 500
+        return http_dates(news)
+
+    return news_response(('list', category), load)
+
+@app.route('/api/news/<int:news_id>', methods=['GET'])
+def get_news_by_id(news_id):
+    def load():
         news = execute_query(
-            """SELECT * FROM news_articles 
-               WHERE published = TRUE
-               ORDER BY created_at DESC""",
+            "SELECT * FROM news_articles WHERE id = %s",
+            (news_id,),
             fetch=True
         )
-    
-    return jsonify(news), 200
 
-@app.route('/api/news/<int:news_id>', methods=['GET'])
-def get_news_by_id(news_id):
-    news = execute_query(
-        "SELECT * FROM news_articles WHERE id = %s",
-        (news_id,),
-        fetch=True
-    )
-    
-    if not news:
-        return jsonify({'message': 'News article not found'}), 404
-    
-    return jsonify(news[0]), 200
+        if not news:
+            return jsonify({'message': 'News article not found'}), 404
+        return http_dates(news[0])
+
+    return news_response(('article', news_id), load)
 
 @app.route('/api/news', methods=['POST'])
 @jwt_required()
@@ -799,9 +1099,17 @@ def create_news_article():
         )
         
         if news_id:
+            invalidate_news_cache()
+
+            # High-priority articles can be emailed to every user right away
+            broadcast_job = None
+            if data.get('broadcast') and data['status'] == 'published':
+                broadcast_job = broadcast.start(news_id)
+
             return jsonify({
                 'message': 'News article created successfully',
-                'id': news_id
+                'id': news_id,
+                'broadcastJob': broadcast_job
             }), 201
         return jsonify({'message': 'Failed to create news article'}), 500
         
@@ -825,7 +1133,8 @@ def update_news_article(news_id):
              data['image_url'], data.get('featured', False),
              data['status'] == 'published', news_id)
         )
-        
+        invalidate_news_cache()
+
         return jsonify({'message': 'News article updated successfully'}), 200
         
     except Exception as e:
@@ -841,13 +1150,44 @@ def delete_news_article(news_id):
             "DELETE FROM news_articles WHERE id = %s",
             (news_id,)
         )
-        
+        invalidate_news_cache()
+
         return jsonify({'message': 'News article deleted successfully'}), 200
         
     except Exception as e:
         print(f"Error deleting news article: {e}")
         return jsonify({'message': f'Error: {str(e)}'}), 500
 
+@app.route('/api/news/<int:news_id>/broadcast', methods=['POST'])
+@jwt_required()
+def broadcast_news_article(news_id):
+    """Email a published article to every user in the background"""
+    news = execute_query(
+        "SELECT id, published FROM news_articles WHERE id = %s",
+        (news_id,),
+        fetch=True
+    )
+
+    if not news:
+        return jsonify({'message': 'News article not found'}), 404
+    if not news[0]['published']:
+        return jsonify({'message': 'Only published articles can be broadcast'}), 400
+
+    job_id = broadcast.start(news_id)
+    if not job_id:
+        return jsonify({'message': 'Failed to start broadcast'}), 500
+
+    return jsonify({'message': 'Broadcast started', 'jobId': job_id}), 202
+
+@app.route('/api/broadcasts/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_broadcast(job_id):
+    """Progress counters of a broadcast job"""
+    job = broadcast.get_job(job_id)
+    if not job:
+        return jsonify({'message': 'Broadcast not found'}), 404
+    return jsonify(job), 200
+
 @app.route('/api/news/upload-image', methods=['POST'])
 @jwt_required()
 def upload_news_image():
@@ -895,15 +1235,22 @@ def upload_news_image():
 def submit_contact_form():
     data = request.get_json()
     
-    contact_id = execute_query(
-        """INSERT INTO contact_messages 
-           (name, email, phone, subject, message)
-           VALUES (%s, %s, %s, %s, %s)""",
-        (data['name'], data['email'], data.get('phone', ''),
-         data['subject'], data['message'])
-    )
-    
+    try:
+        with transaction() as tx:
+            contact_id = tx.execute(
+                """INSERT INTO contact_messages
+                   (name, email, phone, subject, message)
+                   VALUES (%s, %s, %s, %s, %s)""",
+                (data['name'], data['email'], data.get('phone', ''),
+                 data['subject'], data['message'])
+            )
+            bump(tx, (MESSAGES_TOTAL, 1), (MESSAGES_UNREAD, 1))
+    except Exception as e:
+        print(f"Error saving contact message: {e}")
+        contact_id = None
+
     if contact_id:
+        invalidate_dashboard_stats()
         return jsonify({'message': 'Message sent successfully'}), 201
     return jsonify({'message': 'Failed to send message'}), 500
 
@@ -911,12 +1258,117 @@ def submit_contact_form():
 # UTILITY FUNCTIONS
 # ============================================
 
-def generate_tracking_id(prefix):
-    import random
-    import string
-    timestamp = datetime.now().strftime('%Y%m%d')
-    random_str = ''.join(random.choices(string.digits, k=4))
-    return f"{prefix}-{timestamp}-{random_str}"
+# Keyset pagination for admin list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    raw = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor; raises ValueError if it was tampered with"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+def get_page_params(key_length):
+    """Read the limit/cursor query params of a paginated request"""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    cursor = request.args.get('cursor')
+    if not cursor:
+        return limit, None
+
+    values = decode_cursor(cursor)
+    if len(values) != key_length:
+        raise ValueError("Cursor does not match this listing")
+    return limit, values
+
+def status_filter(column):
+    """Condition and params for the optional ?status= filter of a listing ([] when absent or 'all')"""
+    status = request.args.get('status')
+    if not status or status == 'all':
+        return [], []
+    return [f"{column} = %s"], [status]
+
+def where_clause(conditions):
+    return 'WHERE ' + ' AND '.join(f"({condition})" for condition in conditions) if conditions else ''
+
+def keyset_page(rows, limit, key_columns):
+    """
+    Trim rows fetched with LIMIT limit + 1 to one page
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([last[column] for column in key_columns])
+
+# Public tracking lookups
+def invalidate_tracking(kind, tracking_id):
+    """Drop the cached tracking payload for a certificate or appointment whose row changed"""
+    tracking_cache.invalidate((kind, tracking_id))
+
+# Streaming exports
+EXPORT_CHUNK_SIZE = 64 * 1024  # bytes buffered before each write to the client
+
+def stream_json_response(rows, output_format=None):
+    """
+    Build a streaming Response from a db.stream_query RowStream
+
+    output_format 'ndjson' writes one JSON object per line; anything else writes
+    a single JSON array. Rows are encoded as they arrive and flushed in
+    EXPORT_CHUNK_SIZE chunks, so the full result is never held in memory.
+    """
+    ndjson = output_format == 'ndjson'
+
+    def generate():
+        buffer = ['' if ndjson else '[']
+        size = 0
+        first = True
+        try:
+            for row in rows:
+                encoded = app.json.dumps(row)
+                if ndjson:
+                    encoded += '\n'
+                elif not first:
+                    encoded = ',' + encoded
+                first = False
+                buffer.append(encoded)
+                size += len(encoded)
+                if size >= EXPORT_CHUNK_SIZE:
+                    yield ''.join(buffer)
+                    buffer = []
+                    size = 0
+        except Exception as e:
+            # Headers are already sent, so the best we can do is cut the stream short
+            print(f"Error streaming export: {e}")
+            raise
+        finally:
+            rows.close()
+        if not ndjson:
+            buffer.append(']')
+        yield ''.join(buffer)
+
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    response = Response(generate(), mimetype=mimetype)
+    # The server closes the response even if the body was never iterated (client
+    # gone before the first chunk), which releases the DB connection
+    response.call_on_close(rows.close)
+    return response
 
 # ============================================
 # ADMIN ENDPOINTS
@@ -925,27 +1377,33 @@ def generate_tracking_id(prefix):
 @app.route('/api/admin/dashboard', methods=['GET'])
 @jwt_required()
 def get_dashboard_stats():
-    stats = {
-        'totalCertificates': execute_query(
-            "SELECT COUNT(*) as count FROM certificate_requests",
-            fetch=True
-        )[0]['count'],
-        'pendingCertificates': execute_query(
-            "SELECT COUNT(*) as count FROM certificate_requests WHERE status = 'pending'",
-            fetch=True
-        )[0]['count'],
-        'totalAppointments': execute_query(
-            "SELECT COUNT(*) as count FROM appointments",
-            fetch=True
-        )[0]['count'],
-        'todayAppointments': execute_query(
-            "SELECT COUNT(*) as count FROM appointments WHERE appointment_date = CURDATE()",
-            fetch=True
-        )[0]['count']
-    }
-    
+    """Dashboard counts read from stats_counters, served from a short-TTL cache"""
+    stats = dashboard_cache.get('stats')
+    if stats is not None:
+        return jsonify(stats), 200
+
+    stats = dashboard_counts()
+    if stats is None:
+        return jsonify({'message': 'Failed to load dashboard statistics'}), 500
+
+    dashboard_cache.set('stats', stats)
+
     return jsonify(stats), 200
 
+def invalidate_dashboard_stats():
+    """Drop the cached dashboard counts after a certificate, appointment or message write"""
+    dashboard_cache.clear()
+
+@app.route('/api/admin/db-stats', methods=['GET'])
+@jwt_required()
+def get_db_stats():
+    """Per-statement latency histograms, connection pool usage and tracking filter state for this worker"""
+    return jsonify({
+        'statements': query_stats.snapshot(),
+        'pool': pool_stats(),
+        'trackingFilter': tracking_index.stats()
+    }), 200
+
 # ============================================
 # CONTACT MESSAGES ENDPOINTS
 # ============================================
@@ -953,46 +1411,93 @@ def get_dashboard_stats():
 @app.route('/api/contact/messages', methods=['GET'])
 @jwt_required()
 def get_all_messages():
-    """Get all contact messages for admin dashboard"""
+    """Get contact messages for admin dashboard, newest first, one page at a time (optional ?status=)"""
+    try:
+        limit, cursor = get_page_params(2)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
+
+    conditions, params = status_filter('status')
+    if cursor:
+        created_at, last_id = cursor
+        conditions.append("created_at < %s OR (created_at = %s AND id < %s)")
+        params += [created_at, created_at, last_id]
+    where = where_clause(conditions)
+
     messages = execute_query(
-        """SELECT * FROM contact_messages 
-           ORDER BY created_at DESC""",
+        f"""SELECT * FROM contact_messages
+           {where}
+           ORDER BY created_at DESC, id DESC
+           LIMIT %s""",
+        (*params, limit + 1),
         fetch=True
     )
-    
-    # Convert datetime to string for JSON serialization
-    if messages:
-        for msg in messages:
-            if 'created_at' in msg and msg['created_at'] is not None:
-                msg['created_at'] = msg['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-    
-    return jsonify(messages), 200
+
+    if messages is None:
+        return jsonify({'message': 'Failed to load messages'}), 500
+
+    messages, next_cursor = keyset_page(messages, limit, ('created_at', 'id'))
+
+    return jsonify({'items': messages, 'nextCursor': next_cursor}), 200
 
 @app.route('/api/contact/messages/<int:message_id>/mark-read', methods=['PUT'])
 @jwt_required()
 def mark_message_read(message_id):
     """Mark a contact message as read"""
-    execute_query(
-        """UPDATE contact_messages 
-           SET status = 'read' 
-           WHERE id = %s""",
-        (message_id,)
-    )
-    
+    try:
+        mark_message_as_read(message_id)
+    except Exception as e:
+        print(f"Error marking message as read: {e}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+    invalidate_dashboard_stats()
+
     return jsonify({'message': 'Message marked as read'}), 200
 
 @app.route('/api/contact/messages/<int:message_id>', methods=['DELETE'])
 @jwt_required()
 def delete_message(message_id):
     """Delete a contact message"""
-    execute_query(
-        """DELETE FROM contact_messages 
-           WHERE id = %s""",
-        (message_id,)
-    )
-    
+    try:
+        with transaction() as tx:
+            message = tx.execute(
+                "SELECT status FROM contact_messages WHERE id = %s FOR UPDATE",
+                (message_id,),
+                fetch=True
+            )
+
+            if message:
+                tx.execute(
+                    """DELETE FROM contact_messages
+                       WHERE id = %s""",
+                    (message_id,)
+                )
+                bump(tx, (MESSAGES_TOTAL, -1),
+                     status_change(MESSAGES_UNREAD, message[0]['status'], None, 'unread'))
+    except Exception as e:
+        print(f"Error deleting message: {e}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+    invalidate_dashboard_stats()
+
     return jsonify({'message': 'Message deleted successfully'}), 200
 
+def mark_message_as_read(message_id):
+    """Set a message's status to read and keep the unread counter in step"""
+    with transaction() as tx:
+        message = tx.execute(
+            "SELECT status FROM contact_messages WHERE id = %s FOR UPDATE",
+            (message_id,),
+            fetch=True
+        )
+
+        if message:
+            tx.execute(
+                """UPDATE contact_messages
+                   SET status = 'read'
+                   WHERE id = %s""",
+                (message_id,)
+            )
+            bump(tx, status_change(MESSAGES_UNREAD, message[0]['status'], 'read', 'unread'))
+
 @app.route('/api/contact/messages/<int:message_id>/reply', methods=['POST'])
 @jwt_required()
 def reply_to_message(message_id):
@@ -1012,31 +1517,36 @@ def reply_to_message(message_id):
     msg = message[0]
     
     try:
-        # Send reply email
-        email_sent = send_message_reply(
+        # Queue reply email
+        email_job = outbox.submit(
+            send_message_reply,
+            kind='message_reply',
             recipient_email=msg['email'],
             recipient_name=msg['name'],
             subject=f"Re: {msg['subject']}",
             message_body=data['reply'],
             original_message=msg['message']
         )
-        
-        if email_sent:
-            # Mark message as read after reply
-            execute_query(
-                """UPDATE contact_messages 
-                   SET status = 'read' 
-                   WHERE id = %s""",
-                (message_id,)
-            )
-            return jsonify({'message': 'Reply sent successfully'}), 200
-        else:
-            return jsonify({'message': 'Failed to send reply'}), 500
-            
+
+        # Mark message as read once the reply is accepted
+        mark_message_as_read(message_id)
+        invalidate_dashboard_stats()
+        return jsonify({'message': 'Reply queued for delivery', 'emailJob': email_job}), 200
+
+
     except Exception as e:
         print(f"Error sending reply: {e}")
         return jsonify({'message': f'Error: {str(e)}'}), 500
 
+@app.route('/api/outbox/<job_id>', methods=['GET'])
+@jwt_required()
+def get_outbox_job(job_id):
+    """Delivery status of a queued email (queued, sending, retrying, sent or failed)"""
+    job = outbox.status(job_id)
+    if not job:
+        return jsonify({'message': 'Job not found or expired'}), 404
+    return jsonify(job), 200
+
 # ============================================
 # FILE SERVING ENDPOINTS
 # ============================================
@@ -1054,6 +1564,37 @@ def serve_uploaded_file(filename):
         print(f"Error serving file: {e}")
         return jsonify({'message': 'Error serving file'}), 500
 
+@app.route('/api/certificates/<int:cert_id>/pdf', methods=['GET'])
+@jwt_required()
+def download_certificate(cert_id):
+    """Download an approved certificate's PDF, re-rendered in memory when it was not kept on disk"""
+    try:
+        cert = execute_query(
+            """SELECT cr.certificate_type, cr.tracking_id, cr.purpose, cr.status, cr.processed_at,
+                      u.first_name, u.last_name
+               FROM certificate_requests cr
+               JOIN users u ON cr.user_id = u.id
+               WHERE cr.id = %s""",
+            (cert_id,),
+            fetch=True
+        )
+        if not cert or cert[0]['status'] != 'approved':
+            return jsonify({'message': 'Approved certificate not found'}), 404
+        cert = cert[0]
+
+        filename = certificate_filename(cert['certificate_type'], cert['tracking_id'])
+        file_path = os.path.join(CERTIFICATES_DIR, filename)
+        if os.path.exists(file_path):
+            return send_file(file_path, mimetype='application/pdf', as_attachment=True, download_name=filename)
+
+        filename, pdf_bytes = render_certificate(cert['certificate_type'],
+                                                 certificate_pdf_data(cert, cert['processed_at']))
+        return send_file(io.BytesIO(pdf_bytes), mimetype='application/pdf', as_attachment=True,
+                         download_name=filename)
+    except Exception as e:
+        print(f"Error serving certificate: {e}")
+        return jsonify({'message': 'Error serving certificate'}), 500
+
 @app.route('/uploads/news/<path:filename>', methods=['GET'])
 def serve_news_image(filename):
     """Serve news images (public, no auth required)"""
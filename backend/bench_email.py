@@ -0,0 +1,139 @@
+"""
+Email throughput benchmark
+
+Drives every send_* helper in email_utils against an in-process SMTP sink
+(smtp_sink.py), so it runs offline. For each helper it reports messages per
+second, p50/p99 latency and bytes on the wire; certificate approvals are
+measured both with and without the generated PDF attached.
+
+Usage:
+    python bench_email.py [--messages N] [--concurrency N] [--sessions N]
+
+Exits non-zero if any send fails.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from smtp_sink import SMTPSink
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def scenarios(email_utils, pdf):
+    """(name, send) pairs; send(n) delivers the n-th message of a run"""
+    def recipient(n):
+        return f"resident{n}@example.com"
+
+    return [
+        ('certificate_received', lambda n: email_utils.send_certificate_request_received_email(
+            recipient(n), 'Juan Dela Cruz', 'Barangay Clearance', f'CERT-BENCH-{n:06d}')),
+        ('certificate_approval', lambda n: email_utils.send_certificate_approval_email(
+            recipient(n), 'Juan Dela Cruz', 'Barangay Clearance', f'CERT-BENCH-{n:06d}', None)),
+        ('certificate_approval+pdf', lambda n: email_utils.send_certificate_approval_email(
+            recipient(n), 'Juan Dela Cruz', 'Barangay Clearance', f'CERT-BENCH-{n:06d}', pdf)),
+        ('certificate_rejection', lambda n: email_utils.send_certificate_rejection_email(
+            recipient(n), 'Juan Dela Cruz', 'Barangay Clearance', f'CERT-BENCH-{n:06d}',
+            'Missing proof of residency')),
+        ('appointment_received', lambda n: email_utils.send_appointment_request_received_email(
+            recipient(n), 'Juan Dela Cruz', 'Vaccination', '2025-01-20', '09:30:00', f'APPT-BENCH-{n:06d}')),
+        ('appointment_confirmation', lambda n: email_utils.send_appointment_confirmation_email(
+            recipient(n), 'Juan Dela Cruz', 'Vaccination', '2025-01-20', '09:30:00', f'APPT-BENCH-{n:06d}')),
+        ('message_reply', lambda n: email_utils.send_message_reply(
+            recipient(n), 'Juan Dela Cruz', 'Re: Garbage collection schedule',
+            'Collection is every Tuesday and Friday.\nThank you for asking.',
+            'When is garbage collected on our street?')),
+        ('announcement', lambda n: email_utils.send_announcement_email(
+            recipient(n), 'Juan Dela Cruz', 'Community clean-up drive', 'Events',
+            'Join us this Saturday at 7 AM at the covered court.')),
+    ]
+
+
+def run(name, send, sink, messages, concurrency):
+    sink.reset()
+    latencies = []
+
+    def timed(n):
+        started = time.perf_counter()
+        ok = send(n)
+        latencies.append(time.perf_counter() - started)
+        return ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, range(messages)))
+    elapsed = time.perf_counter() - started
+
+    stats = sink.stats()
+    return {
+        'name': name,
+        'sent': results.count(True),
+        'failed': results.count(False),
+        'perSecond': messages / elapsed,
+        'p50': percentile(latencies, 0.50) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'bytes': stats['bytesReceived'],
+        'bytesPerMessage': stats['bytesReceived'] / max(stats['messages'], 1)
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Email throughput benchmark')
+    parser.add_argument('--messages', type=int, default=200, help='messages per helper')
+    parser.add_argument('--concurrency', type=int, default=4, help='sending threads')
+    parser.add_argument('--sessions', type=int, default=None,
+                        help='pooled SMTP sessions (default: EMAIL_SMTP_SESSIONS or --concurrency)')
+    args = parser.parse_args(argv[1:])
+
+    sink = SMTPSink().start()
+
+    # email_utils reads its configuration at import time
+    os.environ.update({
+        'EMAIL_HOST': sink.host,
+        'EMAIL_PORT': str(sink.port),
+        'EMAIL_USE_TLS': 'false',
+        'EMAIL_USE_AUTH': 'false'
+    })
+    if args.sessions:
+        os.environ['EMAIL_SMTP_SESSIONS'] = str(args.sessions)
+    else:
+        os.environ.setdefault('EMAIL_SMTP_SESSIONS', str(args.concurrency))
+    import email_utils
+    from pdf_generator import render_certificate
+
+    pdf = render_certificate('Barangay Clearance', {
+        'name': 'Juan Dela Cruz',
+        'tracking_id': f'BENCH-{os.getpid()}',
+        'purpose': 'Benchmark'
+    })
+
+    print(f"{args.messages} messages per helper, {args.concurrency} threads, "
+          f"{email_utils.EMAIL_SMTP_SESSIONS} SMTP sessions, PDF {len(pdf[1])} bytes")
+    print(f"{'helper':<28}{'msg/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'bytes/msg':>12}{'total bytes':>14}{'failed':>8}")
+
+    failed = 0
+    try:
+        for name, send in scenarios(email_utils, pdf):
+            # Helpers print one line per message; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run(name, send, sink, args.messages, args.concurrency)
+            failed += result['failed']
+            print(f"{result['name']:<28}{result['perSecond']:>10.1f}{result['p50']:>10.2f}"
+                  f"{result['p99']:>10.2f}{result['bytesPerMessage']:>12.0f}{result['bytes']:>14}"
+                  f"{result['failed']:>8}")
+    finally:
+        sink.stop()
+
+    print(f"SMTP connects: {email_utils.smtp_stats['connects']}, "
+          f"reconnects: {email_utils.smtp_stats['reconnects']}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,256 @@
+"""
+Bulk announcement mailer
+
+Emails a news article to every user. Recipients are read from `users` in
+keyset batches, sent over the pooled SMTP sessions in email_utils, throttled
+by a token bucket so the provider's quota is never exceeded, and
+checkpointed into broadcast_jobs after every batch. A job interrupted by a
+crash or restart continues from its last checkpoint; at most one batch can
+be sent twice.
+
+A running job refreshes its lease (updated_at) after every batch. A job can
+be claimed by another process only once its lease is BROADCAST_LEASE seconds
+old, so two workers never send the same job at once.
+
+Usage:
+    python broadcast.py resume            Resume every unfinished job whose lease has expired
+    python broadcast.py resume <job_id>   Resume one job
+    python broadcast.py status <job_id>   Print a job's progress
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from db import execute_query, transaction
+from email_utils import send_announcement_email, PermanentEmailError
+
+BROADCAST_BATCH_SIZE = int(os.getenv('BROADCAST_BATCH_SIZE', 200))
+BROADCAST_RATE = float(os.getenv('BROADCAST_RATE', 10))  # messages per second
+BROADCAST_BURST = int(os.getenv('BROADCAST_BURST', 20))
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', 2))
+BROADCAST_LEASE = int(os.getenv('BROADCAST_LEASE', 300))  # seconds
+
+# Job states
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+class TokenBucket:
+    """Blocking rate limiter: `rate` tokens per second, bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def create_job(news_id):
+    """Record a broadcast of article news_id; returns the job id or None"""
+    total = execute_query("SELECT COUNT(*) AS total FROM users", fetch=True)
+    if total is None:
+        return None
+    return execute_query(
+        """INSERT INTO broadcast_jobs (news_id, status, total)
+           VALUES (%s, %s, %s)""",
+        (news_id, PENDING, total[0]['total'])
+    )
+
+
+def get_job(job_id):
+    """Progress of a job as an API payload, or None if it does not exist"""
+    rows = execute_query(
+        """SELECT id, news_id, status, total, sent, failed, last_user_id,
+                  error, created_at, updated_at, finished_at
+           FROM broadcast_jobs WHERE id = %s""",
+        (job_id,),
+        fetch=True
+    )
+    if not rows:
+        return None
+    job = rows[0]
+    return {
+        'id': job['id'],
+        'newsId': job['news_id'],
+        'status': job['status'],
+        'total': job['total'],
+        'sent': job['sent'],
+        'failed': job['failed'],
+        'lastUserId': job['last_user_id'],
+        'error': job['error'],
+        'createdAt': job['created_at'],
+        'updatedAt': job['updated_at'],
+        'finishedAt': job['finished_at']
+    }
+
+
+def claim(job_id):
+    """Take the job's lease; False if another process is running it or it is finished"""
+    with transaction() as tx:
+        tx.execute(
+            """UPDATE broadcast_jobs
+               SET status = %s, updated_at = NOW()
+               WHERE id = %s
+               AND (status = %s OR (status = %s AND updated_at < NOW() - INTERVAL %s SECOND))""",
+            (RUNNING, job_id, PENDING, RUNNING, BROADCAST_LEASE)
+        )
+        return tx.rowcount == 1
+
+
+def checkpoint(job_id, last_user_id, sent, failed):
+    """Persist progress after a batch; also renews the lease"""
+    execute_query(
+        """UPDATE broadcast_jobs
+           SET last_user_id = %s, sent = sent + %s, failed = failed + %s, updated_at = NOW()
+           WHERE id = %s""",
+        (last_user_id, sent, failed, job_id)
+    )
+
+
+def finish(job_id, status, error=None):
+    execute_query(
+        """UPDATE broadcast_jobs
+           SET status = %s, error = %s, finished_at = NOW(), updated_at = NOW()
+           WHERE id = %s""",
+        (status, error, job_id)
+    )
+
+
+def run(job_id):
+    """Send a job from its checkpoint to the end; runs in the calling thread"""
+    if not claim(job_id):
+        print(f"Broadcast {job_id} is finished or running elsewhere")
+        return False
+
+    try:
+        job = execute_query(
+            """SELECT b.last_user_id, n.title, n.category, n.excerpt
+               FROM broadcast_jobs b
+               JOIN news_articles n ON b.news_id = n.id
+               WHERE b.id = %s""",
+            (job_id,),
+            fetch=True
+        )
+        if not job:
+            finish(job_id, FAILED, 'Article not found')
+            return False
+        article = job[0]
+        last_user_id = article['last_user_id']
+
+        bucket = TokenBucket(BROADCAST_RATE, BROADCAST_BURST)
+
+        def deliver(user):
+            bucket.acquire()
+            name = f"{user['first_name']} {user['last_name']}".strip()
+            try:
+                return send_announcement_email(
+                    recipient_email=user['email'],
+                    recipient_name=name,
+                    title=article['title'],
+                    category=article['category'],
+                    excerpt=article['excerpt']
+                )
+            except PermanentEmailError:
+                # One bad address counts as a failed send; it must not stop the broadcast
+                return False
+
+        with ThreadPoolExecutor(max_workers=BROADCAST_CONCURRENCY) as executor:
+            while True:
+                users = execute_query(
+                    """SELECT id, email, first_name, last_name
+                       FROM users
+                       WHERE id > %s
+                       ORDER BY id
+                       LIMIT %s""",
+                    (last_user_id, BROADCAST_BATCH_SIZE),
+                    fetch=True
+                )
+                if users is None:
+                    raise RuntimeError("Could not load recipients")
+                if not users:
+                    break
+
+                results = list(executor.map(deliver, users))
+                last_user_id = users[-1]['id']
+                checkpoint(job_id, last_user_id, results.count(True), results.count(False))
+
+        finish(job_id, COMPLETED)
+        print(f"Broadcast {job_id} completed")
+        return True
+
+    except Exception as e:
+        # Leave the job resumable from its last checkpoint
+        print(f"Broadcast {job_id} stopped: {e}")
+        finish(job_id, FAILED, str(e))
+        return False
+
+
+def start(news_id):
+    """Create a broadcast for an article and send it on a background thread; returns the job id"""
+    job_id = create_job(news_id)
+    if job_id:
+        threading.Thread(target=run, args=(job_id,), name=f'broadcast-{job_id}', daemon=True).start()
+    return job_id
+
+
+def resume(job_id=None):
+    """Resume one job, or every unfinished job (pending, failed, or running with an expired lease)"""
+    if job_id is not None:
+        execute_query(
+            "UPDATE broadcast_jobs SET status = %s, finished_at = NULL WHERE id = %s AND status = %s",
+            (PENDING, job_id, FAILED)
+        )
+        return run(job_id)
+
+    execute_query(
+        "UPDATE broadcast_jobs SET status = %s, finished_at = NULL WHERE status = %s",
+        (PENDING, FAILED)
+    )
+    # Jobs another process is still sending (live lease) are left to it
+    jobs = execute_query(
+        """SELECT id FROM broadcast_jobs
+           WHERE status = %s OR (status = %s AND updated_at < NOW() - INTERVAL %s SECOND)
+           ORDER BY id""",
+        (PENDING, RUNNING, BROADCAST_LEASE),
+        fetch=True
+    ) or []
+    return all([run(job['id']) for job in jobs])
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else None
+    job_id = int(argv[2]) if len(argv) > 2 else None
+
+    if command == 'resume':
+        return 0 if resume(job_id) else 1
+    if command == 'status' and job_id is not None:
+        job = get_job(job_id)
+        if not job:
+            print(f"Broadcast {job_id} not found")
+            return 1
+        for key, value in job.items():
+            print(f"{key}: {value}")
+        return 0
+
+    print(__doc__)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
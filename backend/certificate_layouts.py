@@ -0,0 +1,109 @@
+"""
+Certificate layouts
+
+One entry per certificate type. pdf_generator compiles a layout into a draw
+plan the first time that type is generated, so a new certificate type is a
+new entry here.
+
+Text may use {name}, {address}, {purpose}, {tracking_id}, {date_issued}
+("January 14, 2025") and {day_issued} ("14 day of January, 2025"). Fields
+missing from the request data fall back to the layout's defaults. Body text
+is wrapped to the page width by measured font metrics.
+"""
+
+# Font, size, line spacing and extra space after a block, in points
+STYLES = {
+    'body': {'font': 'Helvetica', 'size': 12, 'leading': 20, 'space_after': 20},
+    'purpose': {'font': 'Helvetica-Bold', 'size': 12, 'leading': 20, 'space_after': 20},
+    'note': {'font': 'Helvetica', 'size': 11, 'leading': 15, 'space_after': 45}
+}
+
+LAYOUTS = {
+    'Barangay Clearance': {
+        'file_prefix': 'Barangay_Clearance',
+        'office_line': "Tel: (02) 8123-4567 | Email: brgynit@gmail.com",
+        'title': "BARANGAY CLEARANCE",
+        'number_label': "Certificate No",
+        'defaults': {
+            'address': 'Barangay NIT, Accenture Campus',
+            'purpose': 'For whatever legal purpose it may serve'
+        },
+        'body': [
+            ('body', "This is to certify that {name}, of legal age, Filipino citizen, and a resident of "
+                     "{address}, is personally known to me and is of good moral character and reputation "
+                     "in the community."),
+            ('purpose', "PURPOSE: {purpose}"),
+            ('note', "This clearance is valid for Six (6) months from the date of issue unless revoked "
+                     "or cancelled for any violation of existing laws or ordinances.")
+        ],
+        'signatures': [
+            ("Issued by:", "Barangay Secretary", "MARIA T. SANTOS"),
+            ("Certified by:", "Barangay Captain", "JUAN D. DELA CRUZ")
+        ],
+        'footer_note': "This is a computer-generated certificate. No signature required."
+    },
+    'Certificate of Indigency': {
+        'file_prefix': 'Certificate_Indigency',
+        'office_line': "Office of the Barangay Captain",
+        'title': "CERTIFICATE OF INDIGENCY",
+        'number_label': "Certificate No",
+        'defaults': {
+            'purpose': 'Medical/Educational/Financial Assistance'
+        },
+        'body': [
+            ('body', "This is to certify that {name}, of legal age, Filipino, and a bonafide resident of "
+                     "Barangay NIT, Accenture Campus, belongs to the indigent families of this Barangay "
+                     "as per record of the Barangay Social Welfare Office."),
+            ('purpose', "PURPOSE: {purpose}"),
+            ('note', "Issued upon the request of the above-named person for whatever legal purpose it may serve.")
+        ],
+        'signatures': [
+            ("Issued by:", "Barangay Social Welfare Officer", None),
+            ("Certified by:", "Barangay Captain", None)
+        ],
+        'footer_note': "This is a computer-generated certificate."
+    },
+    'Certificate of Residency': {
+        'file_prefix': 'Certificate_Residency',
+        'office_line': "Office of the Barangay Captain",
+        'title': "CERTIFICATE OF RESIDENCY",
+        'number_label': "Certificate No",
+        'defaults': {
+            'address': 'Accenture Campus',
+            'purpose': 'For whatever legal purpose it may serve'
+        },
+        'body': [
+            ('body', "This is to certify that {name}, of legal age, Filipino citizen, is a bonafide resident "
+                     "of Barangay NIT, {address} as shown in the records of this Barangay."),
+            ('purpose', "PURPOSE: {purpose}"),
+            ('note', "Issued upon the request of the above-named person this {day_issued} at Barangay NIT, "
+                     "Accenture Campus.")
+        ],
+        'signatures': [
+            ("Issued by:", "Barangay Secretary", None),
+            ("Certified by:", "Barangay Captain", None)
+        ],
+        'footer_note': "This is a computer-generated certificate."
+    },
+    'Business Permit Clearance': {
+        'file_prefix': 'Business_Clearance',
+        'office_line': "Business Permits and Licensing Office",
+        'title': "BUSINESS PERMIT CLEARANCE",
+        'number_label': "Clearance No",
+        'defaults': {
+            'purpose': 'Business Registration and Permit Application'
+        },
+        'body': [
+            ('body', "This is to certify that {name} has been cleared to operate a business within the "
+                     "jurisdiction of Barangay NIT, Accenture Campus, subject to compliance with all "
+                     "applicable laws, ordinances, and regulations."),
+            ('purpose', "PURPOSE: {purpose}"),
+            ('note', "This clearance is valid for one (1) year from the date of issue.")
+        ],
+        'signatures': [
+            ("Approved by:", "Business Permits Officer", None),
+            ("Noted by:", "Barangay Captain", None)
+        ],
+        'footer_note': "This is a computer-generated clearance."
+    }
+}
@@ -0,0 +1,136 @@
+"""
+Incrementally maintained counters behind the admin dashboard
+
+Every write that changes a counted row also updates stats_counters inside the
+same transaction, so dashboard reads are primary-key lookups regardless of
+table size.
+
+Usage:
+    python counters.py reconcile    Recompute every counter from the source tables
+"""
+import sys
+from db import execute_query, transaction
+
+# Global counters (scope '')
+CERTIFICATES_TOTAL = 'certificates_total'
+CERTIFICATES_PENDING = 'certificates_pending'
+CERTIFICATES_APPROVED = 'certificates_approved'
+CERTIFICATES_REJECTED = 'certificates_rejected'
+APPOINTMENTS_TOTAL = 'appointments_total'
+APPOINTMENTS_PENDING = 'appointments_pending'
+MESSAGES_TOTAL = 'messages_total'
+MESSAGES_UNREAD = 'messages_unread'
+
+# Per-day counter, scoped by 'YYYY-MM-DD'
+APPOINTMENTS_ON = 'appointments_on'
+
+RECONCILE_STATEMENTS = [
+    "DELETE FROM stats_counters",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{CERTIFICATES_TOTAL}', '', COUNT(*) FROM certificate_requests""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{CERTIFICATES_PENDING}', '', COUNT(*) FROM certificate_requests WHERE status = 'pending'""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{CERTIFICATES_APPROVED}', '', COUNT(*) FROM certificate_requests WHERE status = 'approved'""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{CERTIFICATES_REJECTED}', '', COUNT(*) FROM certificate_requests WHERE status = 'rejected'""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{APPOINTMENTS_TOTAL}', '', COUNT(*) FROM appointments""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{APPOINTMENTS_PENDING}', '', COUNT(*) FROM appointments WHERE status = 'pending'""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{APPOINTMENTS_ON}', CAST(appointment_date AS CHAR), COUNT(*)
+        FROM appointments
+        GROUP BY appointment_date""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{MESSAGES_TOTAL}', '', COUNT(*) FROM contact_messages""",
+    f"""INSERT INTO stats_counters (name, scope, value)
+        SELECT '{MESSAGES_UNREAD}', '', COUNT(*) FROM contact_messages WHERE status = 'unread'"""
+]
+
+
+def bump(tx, *changes):
+    """
+    Apply counter deltas inside an open transaction in a single statement
+
+    Each change is (name, delta) or (name, delta, scope); zero deltas are skipped.
+    Example: bump(tx, (CERTIFICATES_TOTAL, 1), (CERTIFICATES_PENDING, 1))
+    """
+    rows = []
+    for change in changes:
+        name, delta = change[0], change[1]
+        scope = str(change[2]) if len(change) > 2 else ''
+        if delta:
+            rows.append((name, scope, delta))
+    if not rows:
+        return
+
+    placeholders = ', '.join(['(%s, %s, %s)'] * len(rows))
+    params = [value for row in rows for value in row]
+    tx.execute(
+        f"""INSERT INTO stats_counters (name, scope, value)
+            VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE value = value + VALUES(value)""",
+        params
+    )
+
+
+def status_change(counter, old_status, new_status, counted_status):
+    """Delta for a status counter when a row moves from old_status to new_status"""
+    delta = int(new_status == counted_status) - int(old_status == counted_status)
+    return (counter, delta)
+
+
+def certificate_status_changes(old_status, new_status):
+    """Deltas for every certificate status counter when a request moves from old_status to new_status"""
+    return (
+        status_change(CERTIFICATES_PENDING, old_status, new_status, 'pending'),
+        status_change(CERTIFICATES_APPROVED, old_status, new_status, 'approved'),
+        status_change(CERTIFICATES_REJECTED, old_status, new_status, 'rejected')
+    )
+
+
+def dashboard_counts():
+    """Dashboard counters in one primary-key lookup query, or None if the DB is unavailable"""
+    rows = execute_query(
+        """SELECT name, value FROM stats_counters
+           WHERE (scope = '' AND name IN (%s, %s, %s, %s, %s, %s))
+              OR (name = %s AND scope = CAST(CURDATE() AS CHAR))""",
+        (CERTIFICATES_TOTAL, CERTIFICATES_PENDING, CERTIFICATES_APPROVED, CERTIFICATES_REJECTED,
+         APPOINTMENTS_TOTAL, MESSAGES_UNREAD, APPOINTMENTS_ON),
+        fetch=True
+    )
+    if rows is None:
+        return None
+
+    values = {row['name']: int(row['value']) for row in rows}
+    return {
+        'totalCertificates': values.get(CERTIFICATES_TOTAL, 0),
+        'pendingCertificates': values.get(CERTIFICATES_PENDING, 0),
+        'approvedCertificates': values.get(CERTIFICATES_APPROVED, 0),
+        'rejectedCertificates': values.get(CERTIFICATES_REJECTED, 0),
+        'totalAppointments': values.get(APPOINTMENTS_TOTAL, 0),
+        'todayAppointments': values.get(APPOINTMENTS_ON, 0),
+        'unreadMessages': values.get(MESSAGES_UNREAD, 0)
+    }
+
+
+def reconcile():
+    """Rebuild stats_counters from scratch; run after manual data fixes or if counts drift"""
+    with transaction() as tx:
+        for statement in RECONCILE_STATEMENTS:
+            tx.execute(statement)
+    print("stats_counters reconciled")
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else None
+    if command != 'reconcile':
+        print(__doc__)
+        return 2
+    reconcile()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,487 @@
+"""
+Database helpers: pooled MySQL connections and query execution
+"""
+import bisect
+import contextvars
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': int(os.getenv('DB_PORT', '3306')),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', '010724'),
+    'database': os.getenv('DB_NAME', 'barangay_nit')
+}
+
+# Add SSL for cloud databases (like Aiven)
+if 'aivencloud.com' in DB_CONFIG['host']:
+    DB_CONFIG['ssl_disabled'] = False
+
+# Pool configuration
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))      # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))      # seconds before a connection is replaced
+DB_POOL_PING_AFTER = int(os.getenv('DB_POOL_PING_AFTER', 30))  # idle seconds before a checkout pings
+DB_STREAM_BATCH_SIZE = int(os.getenv('DB_STREAM_BATCH_SIZE', 500))  # rows pulled per fetch when streaming
+
+# Instrumentation configuration
+DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 200))  # statements slower than this are logged
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class PoolTimeoutError(Error):
+    """Raised when no pooled connection becomes free within DB_POOL_TIMEOUT"""
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a MySQL connection checked out from a ConnectionPool.
+    Behaves like the underlying connection, except close() hands it back to the pool.
+    """
+
+    def __init__(self, pool, connection, created_at):
+        self._pool = pool
+        self._connection = connection
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise Error("Connection has already been returned to the pool")
+        return getattr(self._connection, name)
+
+    def close(self):
+        if self._connection is not None:
+            self._pool.release(self._connection, self._created_at)
+            self._connection = None
+
+    def discard(self):
+        """Close the underlying connection instead of returning it to the pool"""
+        if self._connection is not None:
+            self._pool.discard(self._connection)
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of MySQL connections.
+
+    Connections are opened lazily up to `size`. On checkout a connection that has
+    been idle for more than `ping_after` seconds is pinged, and connections older
+    than `recycle` seconds are closed and replaced, so the TLS handshake is paid
+    once per connection instead of once per query.
+    """
+
+    def __init__(self, config, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 recycle=DB_POOL_RECYCLE, ping_after=DB_POOL_PING_AFTER):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self._idle = []  # (connection, created_at, returned_at), most recently used last
+        self._open = 0
+        self._cond = threading.Condition()
+        self._counters = {
+            'connects': 0,
+            'checkouts': 0,
+            'reused': 0,
+            'recycled': 0,
+            'failedPings': 0,
+            'waits': 0,
+            'timeouts': 0
+        }
+
+    def acquire(self):
+        """Check out a connection, opening a new one if the pool is not full"""
+        deadline = time.monotonic() + self.timeout
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    connection, created_at, returned_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+                self._counters['waits'] += 1
+                self._cond.wait(remaining)
+            self._counters['checkouts'] += 1
+
+        # Validate the idle connection outside the lock; a bad one frees its slot for a new connect
+        if connection is not None:
+            if self._is_usable(connection, created_at, returned_at):
+                with self._cond:
+                    self._counters['reused'] += 1
+                return PooledConnection(self, connection, created_at)
+            self._close_quietly(connection)
+
+        try:
+            connection = mysql.connector.connect(**self.config)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._counters['connects'] += 1
+        return PooledConnection(self, connection, time.monotonic())
+
+    def release(self, connection, created_at):
+        """Return a connection to the pool, discarding it if it is no longer usable"""
+        try:
+            # Never hand out a connection with an open transaction or a stale snapshot
+            if connection.in_transaction:
+                connection.rollback()
+            usable = True
+        except Exception:
+            usable = False
+
+        with self._cond:
+            if usable:
+                self._idle.append((connection, created_at, time.monotonic()))
+            else:
+                self._open -= 1
+            self._cond.notify()
+
+        if not usable:
+            self._close_quietly(connection)
+
+    def discard(self, connection):
+        """Drop a checked-out connection whose protocol state can't be trusted"""
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+        self._close_quietly(connection)
+
+    def _is_usable(self, connection, created_at, returned_at):
+        now = time.monotonic()
+        if self.recycle and now - created_at > self.recycle:
+            with self._cond:
+                self._counters['recycled'] += 1
+            return False
+        if now - returned_at > self.ping_after:
+            try:
+                connection.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._counters['failedPings'] += 1
+                return False
+        return True
+
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        """Snapshot of pool usage for the health endpoint"""
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'inUse': self._open - len(self._idle),
+                **self._counters
+            }
+
+
+# ============================================
+# QUERY INSTRUMENTATION
+# ============================================
+
+_LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(?:\.\d+)?\b|%s")
+_IN_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=512)
+def normalize_sql(query):
+    """Collapse whitespace and replace literals/placeholders with ? so similar statements share a key"""
+    normalized = _LITERAL_PATTERN.sub('?', ' '.join(query.split()))
+    return _IN_LIST_PATTERN.sub('(?)', normalized)
+
+
+class QueryStats:
+    """Thread-safe per-statement latency histograms keyed by normalized SQL"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._statements = {}
+
+    def record(self, query, elapsed_ms):
+        key = normalize_sql(query)
+        bucket = bisect.bisect_left(self.buckets, elapsed_ms)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                entry = self._statements[key] = {
+                    'count': 0,
+                    'totalMs': 0.0,
+                    'maxMs': 0.0,
+                    'histogram': [0] * (len(self.buckets) + 1)
+                }
+            entry['count'] += 1
+            entry['totalMs'] += elapsed_ms
+            entry['maxMs'] = max(entry['maxMs'], elapsed_ms)
+            entry['histogram'][bucket] += 1
+
+    def snapshot(self):
+        """Statements ordered by total time spent; histogram buckets are upper bounds in ms"""
+        bounds = list(self.buckets) + ['inf']
+        with self._lock:
+            entries = [(sql, dict(entry, histogram=list(entry['histogram'])))
+                       for sql, entry in self._statements.items()]
+
+        result = []
+        for sql, entry in sorted(entries, key=lambda item: item[1]['totalMs'], reverse=True):
+            result.append({
+                'sql': sql,
+                'count': entry['count'],
+                'totalMs': round(entry['totalMs'], 3),
+                'meanMs': round(entry['totalMs'] / entry['count'], 3),
+                'maxMs': round(entry['maxMs'], 3),
+                'histogram': [{'leMs': bound, 'count': count}
+                              for bound, count in zip(bounds, entry['histogram'])]
+            })
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+
+
+query_stats = QueryStats()
+
+# Per-request query count and DB time; set by begin_request_stats() for each request
+_request_stats = contextvars.ContextVar('db_request_stats', default=None)
+
+
+def begin_request_stats():
+    """Start counting queries for the current request"""
+    _request_stats.set({'queries': 0, 'timeMs': 0.0})
+
+
+def current_request_stats():
+    """Queries issued and DB time spent so far in this request, or None outside a request"""
+    return _request_stats.get()
+
+
+def record_query(query, elapsed_ms):
+    query_stats.record(query, elapsed_ms)
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats['queries'] += 1
+        stats['timeMs'] += elapsed_ms
+
+    if elapsed_ms >= DB_SLOW_QUERY_MS:
+        print(f"Slow query ({elapsed_ms:.1f} ms): {normalize_sql(query)}")
+
+
+@contextmanager
+def timed(query):
+    """Time the enclosed round-trip(s) and record them against query"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_query(query, (time.perf_counter() - start) * 1000)
+
+
+pool = ConnectionPool(DB_CONFIG)
+
+
+# Database Connection
+def get_db_connection():
+    try:
+        return pool.acquire()
+    except Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        return None
+
+
+def pool_stats():
+    return pool.stats()
+
+
+# Helper function to execute queries
+def execute_query(query, params=None, fetch=False):
+    connection = get_db_connection()
+    if not connection:
+        return None
+
+    try:
+        cursor = connection.cursor(dictionary=True)
+
+        if fetch:
+            with timed(query):
+                cursor.execute(query, params or ())
+                result = cursor.fetchall()
+            cursor.close()
+            return result
+        else:
+            with timed(query):
+                cursor.execute(query, params or ())
+                connection.commit()
+            last_id = cursor.lastrowid
+            cursor.close()
+            return last_id
+    except Error as e:
+        print(f"Error executing query: {e}")
+        return None
+    finally:
+        connection.close()
+
+
+def stream_query(query, params=None, batch_size=DB_STREAM_BATCH_SIZE):
+    """
+    Run a SELECT on an unbuffered cursor and return a RowStream over its rows
+
+    Rows are read from the server batch_size at a time as the stream is
+    consumed, so memory stays flat regardless of the result size. The query is
+    executed before returning (errors surface to the caller, not mid-stream)
+    and the connection stays checked out until the stream is exhausted or
+    closed; callers must close() it even if they never iterate it.
+    """
+    connection = pool.acquire()
+    try:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        with timed(query):
+            cursor.execute(query, params or ())
+    except Exception:
+        connection.discard()
+        raise
+    return RowStream(connection, cursor, batch_size)
+
+
+class RowStream:
+    """Iterator over a stream_query result that owns its pooled connection"""
+
+    def __init__(self, connection, cursor, batch_size):
+        self._connection = connection
+        self._cursor = cursor
+        self._batch_size = batch_size
+        self._rows = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._connection is None:
+            raise StopIteration
+        try:
+            return next(self._rows)
+        except StopIteration:
+            pass
+        try:
+            rows = self._cursor.fetchmany(self._batch_size)
+        except Exception:
+            self.close()
+            raise
+        if not rows:
+            self._release(exhausted=True)
+            raise StopIteration
+        self._rows = iter(rows)
+        return next(self._rows)
+
+    def close(self):
+        """Give the connection back; safe to call more than once, or before iterating"""
+        self._release(exhausted=False)
+
+    def _release(self, exhausted):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        if exhausted:
+            self._cursor.close()
+            connection.close()
+        else:
+            # Abandoned mid-result (client went away, or never read): the rest of the
+            # result is still on the wire, so drop the connection rather than drain it
+            connection.discard()
+
+
+class Transaction:
+    """Statement runner bound to the single connection of a transaction() block"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+        self._after_commit = []
+
+    def after_commit(self, callback):
+        """Run callback() once the transaction has committed; dropped on rollback"""
+        self._after_commit.append(callback)
+
+    def execute(self, query, params=None, fetch=False):
+        """
+        Run a statement inside the transaction
+
+        Returns the fetched rows when fetch is True, otherwise the last inserted id.
+        Errors are raised so the enclosing transaction() rolls back.
+        """
+        cursor = self.connection.cursor(dictionary=True)
+        try:
+            with timed(query):
+                cursor.execute(query, params or ())
+                result = cursor.fetchall() if fetch else None
+            self.rowcount = cursor.rowcount
+            return result if fetch else cursor.lastrowid
+        finally:
+            cursor.close()
+
+
+@contextmanager
+def transaction():
+    """
+    Unit of work on one pooled connection
+
+    Usage:
+        with transaction() as tx:
+            user = tx.execute("SELECT id FROM users WHERE email = %s", (email,), fetch=True)
+            tx.execute("INSERT INTO ...", (...))
+
+    Commits once when the block exits normally and rolls back if it raises.
+    Callbacks registered with tx.after_commit run after a successful commit.
+    """
+    connection = pool.acquire()
+    tx = Transaction(connection)
+    try:
+        yield tx
+        with timed('COMMIT'):
+            connection.commit()
+    except BaseException:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        connection.close()
+
+    for callback in tx._after_commit:
+        callback()
@@ -1,12 +1,18 @@
 """
 Email utility for sending notifications
 """
+import html
 import smtplib
+import string
+import queue
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 import os
 from dotenv import load_dotenv
+from cache import TTLCache
 
 load_dotenv()
 
@@ -16,6 +22,171 @@ EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
 EMAIL_USER = os.getenv('EMAIL_USER', 'your-email@gmail.com')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', 'your-app-password')
 EMAIL_FROM = os.getenv('EMAIL_FROM', 'Barangay NIT <noreply@barangaynit.com>')
+# Turn off for a local relay or smtp_sink.py, which speak plain SMTP
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'true').lower() == 'true'
+EMAIL_USE_AUTH = os.getenv('EMAIL_USE_AUTH', 'true').lower() == 'true'
+
+# SMTP session reuse
+EMAIL_SMTP_SESSIONS = int(os.getenv('EMAIL_SMTP_SESSIONS', 2))  # open connections kept per worker
+EMAIL_MAX_MESSAGES_PER_CONNECTION = int(os.getenv('EMAIL_MAX_MESSAGES_PER_CONNECTION', 100))
+EMAIL_NOOP_AFTER = float(os.getenv('EMAIL_NOOP_AFTER', 30))  # idle seconds before a NOOP check
+EMAIL_TIMEOUT = float(os.getenv('EMAIL_TIMEOUT', 30))
+
+class SMTPSession:
+    """
+    One authenticated SMTP connection reused across sends
+
+    The connection is opened (STARTTLS + login) on first use, checked with
+    NOOP after sitting idle, and recycled after EMAIL_MAX_MESSAGES_PER_CONNECTION
+    messages. A send that finds the connection dropped reconnects and retries once.
+    """
+
+    def __init__(self):
+        self.server = None
+        self.sent = 0
+        self.last_used = 0.0
+
+    def _connect(self):
+        server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT, timeout=EMAIL_TIMEOUT)
+        if EMAIL_USE_TLS:
+            server.starttls()
+        if EMAIL_USE_AUTH:
+            server.login(EMAIL_USER, EMAIL_PASSWORD)
+        self.server = server
+        self.sent = 0
+        smtp_stats['connects'] += 1
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.server = None
+
+    def _ensure_open(self):
+        if self.server is not None and time.monotonic() - self.last_used > EMAIL_NOOP_AFTER:
+            try:
+                code = self.server.noop()[0]
+            except (smtplib.SMTPException, OSError):
+                code = None
+            if code != 250:
+                smtp_stats['staleDropped'] += 1
+                self.close()
+        if self.server is None:
+            self._connect()
+
+    def send(self, msg):
+        self._ensure_open()
+        try:
+            self.server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # The server closed the connection between checks; reconnect and retry once
+            smtp_stats['reconnects'] += 1
+            self.close()
+            self._connect()
+            self.server.send_message(msg)
+
+        self.sent += 1
+        self.last_used = time.monotonic()
+        if self.sent >= EMAIL_MAX_MESSAGES_PER_CONNECTION:
+            self.close()
+
+class PermanentEmailError(Exception):
+    """The server refused a message for good (5xx); sending it again will not help"""
+    permanent = True
+
+def is_permanent_smtp_error(error):
+    """True for 5xx replies: unknown recipient, sender refused, bad credentials, message rejected"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # Permanent only if every recipient got a 5xx; a 4xx (mailbox busy, greylisting) may clear
+        return bool(error.recipients) and all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+smtp_stats = {'connects': 0, 'reconnects': 0, 'staleDropped': 0}
+_smtp_sessions = queue.LifoQueue()
+_smtp_slots = threading.BoundedSemaphore(EMAIL_SMTP_SESSIONS)
+
+def smtp_send(msg):
+    """Send a message over a pooled SMTP session, waiting if all sessions are busy"""
+    with _smtp_slots:
+        try:
+            session = _smtp_sessions.get_nowait()
+        except queue.Empty:
+            session = SMTPSession()
+        try:
+            session.send(msg)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError):
+            # The server rejected this message; the connection itself is still fine
+            raise
+        except Exception:
+            # Don't hand a half-broken connection to the next sender
+            session.close()
+            raise
+        finally:
+            _smtp_sessions.put(session)
+
+class EmailTemplate:
+    """
+    HTML email layout parsed once into static chunks and $field slots
+
+    render() only escapes and joins the field values. Fields listed in
+    multiline also turn newlines into <br>.
+    """
+
+    def __init__(self, source, multiline=()):
+        self.multiline = frozenset(multiline)
+        self._parts = []  # literal strings and (field_name,) tuples, in order
+        position = 0
+        for match in string.Template.pattern.finditer(source):
+            self._parts.append(source[position:match.start()])
+            name = match.group('named') or match.group('braced')
+            self._parts.append((name,) if name else '$')
+            position = match.end()
+        self._parts.append(source[position:])
+
+    def render(self, **values):
+        out = []
+        for part in self._parts:
+            if isinstance(part, tuple):
+                value = html.escape(str(values[part[0]]))
+                if part[0] in self.multiline:
+                    value = value.replace('\n', '<br>')
+                part = value
+            out.append(part)
+        return ''.join(out)
+
+# Attachment parts keyed by (path, mtime), so a changed file is re-read
+_attachment_parts = TTLCache(maxsize=int(os.getenv('EMAIL_ATTACHMENT_CACHE_SIZE', 64)), ttl=3600)
+
+def _mime_attachment(filename, content):
+    part = MIMEApplication(content, Name=filename)
+    part['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return part
+
+def attachment_part(attachment):
+    """
+    MIME part for an attachment: a (filename, bytes) pair, or a path on disk
+
+    Parts for files are built once per file version; None if the file is missing.
+    """
+    if isinstance(attachment, tuple):
+        return _mime_attachment(*attachment)
+
+    try:
+        mtime = os.path.getmtime(attachment)
+    except OSError:
+        return None
+
+    key = (attachment, mtime)
+    part = _attachment_parts.get(key)
+    if part is None:
+        with open(attachment, 'rb') as file:
+            part = _mime_attachment(os.path.basename(attachment), file.read())
+        _attachment_parts.set(key, part)
+    return part
 
 def send_email(to_email, subject, html_content, attachments=None):
     """
@@ -25,10 +196,13 @@ def send_email(to_email, subject, html_content, attachments=None):
         to_email (str): Recipient email address
         subject (str): Email subject
         html_content (str): HTML content of email
-        attachments (list): List of file paths to attach
+        attachments (list): File paths or (filename, bytes) pairs to attach
     
     Returns:
-        bool: True if sent successfully, False otherwise
+        bool: True if sent successfully, False on a failure that may be temporary
+
+    Raises:
+        PermanentEmailError: the server refused the message with a 5xx reply
     """
     try:
         # Create message
@@ -43,45 +217,37 @@ def send_email(to_email, subject, html_content, attachments=None):
         
         # Add attachments if any
         if attachments:
-            for file_path in attachments:
-                if os.path.exists(file_path):
-                    with open(file_path, 'rb') as file:
-                        part = MIMEApplication(file.read(), Name=os.path.basename(file_path))
-                        part['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
-                        msg.attach(part)
+            for attachment in attachments:
+                part = attachment_part(attachment)
+                if part is not None:
+                    msg.attach(part)
         
-        # Send email
-        with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_USER, EMAIL_PASSWORD)
-            server.send_message(msg)
+        # Send email over a reused SMTP session
+        smtp_send(msg)
         
         print(f"Email sent successfully to {to_email}")
         return True
         
     except Exception as e:
         print(f"Error sending email: {e}")
+        if is_permanent_smtp_error(e):
+            raise PermanentEmailError(str(e)) from e
         return False
 
-def send_certificate_approval_email(recipient_email, recipient_name, certificate_type, tracking_id, pdf_path):
-    """Send certificate approval notification with PDF attachment"""
-    
-    subject = f"Certificate Approved - {certificate_type}"
-    
-    html_content = f"""
+CERTIFICATE_APPROVAL_TEMPLATE = EmailTemplate("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #A100FF, #6B00B8); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; }}
-            .footer {{ background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }}
-            .button {{ display: inline-block; background-color: #A100FF; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .info-box {{ background: white; padding: 15px; border-left: 4px solid #A100FF; margin: 20px 0; }}
-            h1 {{ margin: 0; font-size: 24px; }}
-            h2 {{ color: #A100FF; font-size: 20px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #A100FF, #6B00B8); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; }
+            .footer { background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }
+            .button { display: inline-block; background-color: #A100FF; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+            .info-box { background: white; padding: 15px; border-left: 4px solid #A100FF; margin: 20px 0; }
+            h1 { margin: 0; font-size: 24px; }
+            h2 { color: #A100FF; font-size: 20px; }
         </style>
     </head>
     <body>
@@ -90,13 +256,13 @@ def send_certificate_approval_email(recipient_email, recipient_name, certificate
                 <h1>🎉 Certificate Approved!</h1>
             </div>
             <div class="content">
-                <h2>Dear {recipient_name},</h2>
+                <h2>Dear $recipient_name,</h2>
                 <p>Great news! Your certificate request has been <strong>approved</strong> and is now ready.</p>
                 
                 <div class="info-box">
                     <strong>Certificate Details:</strong><br>
-                    <strong>Type:</strong> {certificate_type}<br>
-                    <strong>Tracking ID:</strong> {tracking_id}<br>
+                    <strong>Type:</strong> $certificate_type<br>
+                    <strong>Tracking ID:</strong> $tracking_id<br>
                     <strong>Status:</strong> <span style="color: #10b981;">Approved</span>
                 </div>
                 
@@ -128,28 +294,34 @@ def send_certificate_approval_email(recipient_email, recipient_name, certificate
         </div>
     </body>
     </html>
-    """
-    
-    return send_email(recipient_email, subject, html_content, [pdf_path] if pdf_path else None)
+    """)
 
-def send_certificate_rejection_email(recipient_email, recipient_name, certificate_type, tracking_id, reason):
-    """Send certificate rejection notification"""
+def send_certificate_approval_email(recipient_email, recipient_name, certificate_type, tracking_id, pdf):
+    """Send certificate approval notification with the PDF attached (a path or a (filename, bytes) pair)"""
     
-    subject = f"Certificate Request Update - {certificate_type}"
+    subject = f"Certificate Approved - {certificate_type}"
     
-    html_content = f"""
+    html_content = CERTIFICATE_APPROVAL_TEMPLATE.render(
+        certificate_type=certificate_type,
+        recipient_name=recipient_name,
+        tracking_id=tracking_id
+    )
+    
+    return send_email(recipient_email, subject, html_content, [pdf] if pdf else None)
+
+CERTIFICATE_REJECTION_TEMPLATE = EmailTemplate("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #ef4444, #dc2626); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; }}
-            .footer {{ background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }}
-            .info-box {{ background: white; padding: 15px; border-left: 4px solid #ef4444; margin: 20px 0; }}
-            h1 {{ margin: 0; font-size: 24px; }}
-            h2 {{ color: #ef4444; font-size: 20px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #ef4444, #dc2626); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; }
+            .footer { background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }
+            .info-box { background: white; padding: 15px; border-left: 4px solid #ef4444; margin: 20px 0; }
+            h1 { margin: 0; font-size: 24px; }
+            h2 { color: #ef4444; font-size: 20px; }
         </style>
     </head>
     <body>
@@ -158,18 +330,18 @@ def send_certificate_rejection_email(recipient_email, recipient_name, certificat
                 <h1>Certificate Request Update</h1>
             </div>
             <div class="content">
-                <h2>Dear {recipient_name},</h2>
+                <h2>Dear $recipient_name,</h2>
                 <p>We regret to inform you that your certificate request requires additional attention.</p>
                 
                 <div class="info-box">
                     <strong>Request Details:</strong><br>
-                    <strong>Type:</strong> {certificate_type}<br>
-                    <strong>Tracking ID:</strong> {tracking_id}<br>
+                    <strong>Type:</strong> $certificate_type<br>
+                    <strong>Tracking ID:</strong> $tracking_id<br>
                     <strong>Status:</strong> <span style="color: #ef4444;">Requires Revision</span>
                 </div>
                 
                 <p><strong>Reason:</strong></p>
-                <p style="background: white; padding: 15px; border-radius: 5px;">{reason}</p>
+                <p style="background: white; padding: 15px; border-radius: 5px;">$reason</p>
                 
                 <p><strong>What to do next?</strong></p>
                 <ul>
@@ -197,28 +369,35 @@ def send_certificate_rejection_email(recipient_email, recipient_name, certificat
         </div>
     </body>
     </html>
-    """
-    
-    return send_email(recipient_email, subject, html_content)
+    """)
 
-def send_appointment_confirmation_email(recipient_email, recipient_name, service_type, date, time, tracking_id):
-    """Send appointment confirmation email"""
+def send_certificate_rejection_email(recipient_email, recipient_name, certificate_type, tracking_id, reason):
+    """Send certificate rejection notification"""
     
-    subject = f"Appointment Confirmed - {service_type}"
+    subject = f"Certificate Request Update - {certificate_type}"
+    
+    html_content = CERTIFICATE_REJECTION_TEMPLATE.render(
+        certificate_type=certificate_type,
+        reason=reason,
+        recipient_name=recipient_name,
+        tracking_id=tracking_id
+    )
     
-    html_content = f"""
+    return send_email(recipient_email, subject, html_content)
+
+APPOINTMENT_CONFIRMATION_TEMPLATE = EmailTemplate("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; }}
-            .footer {{ background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }}
-            .info-box {{ background: white; padding: 15px; border-left: 4px solid #10b981; margin: 20px 0; }}
-            h1 {{ margin: 0; font-size: 24px; }}
-            h2 {{ color: #10b981; font-size: 20px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; }
+            .footer { background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }
+            .info-box { background: white; padding: 15px; border-left: 4px solid #10b981; margin: 20px 0; }
+            h1 { margin: 0; font-size: 24px; }
+            h2 { color: #10b981; font-size: 20px; }
         </style>
     </head>
     <body>
@@ -227,15 +406,15 @@ def send_appointment_confirmation_email(recipient_email, recipient_name, service
                 <h1>✅ Appointment Confirmed!</h1>
             </div>
             <div class="content">
-                <h2>Dear {recipient_name},</h2>
+                <h2>Dear $recipient_name,</h2>
                 <p>Your health center appointment has been confirmed!</p>
                 
                 <div class="info-box">
                     <strong>Appointment Details:</strong><br>
-                    <strong>Service:</strong> {service_type}<br>
-                    <strong>Date:</strong> {date}<br>
-                    <strong>Time:</strong> {time}<br>
-                    <strong>Tracking ID:</strong> {tracking_id}
+                    <strong>Service:</strong> $service_type<br>
+                    <strong>Date:</strong> $date<br>
+                    <strong>Time:</strong> $time<br>
+                    <strong>Tracking ID:</strong> $tracking_id
                 </div>
                 
                 <p><strong>Important Reminders:</strong></p>
@@ -265,27 +444,37 @@ def send_appointment_confirmation_email(recipient_email, recipient_name, service
         </div>
     </body>
     </html>
-    """
+    """)
+
+def send_appointment_confirmation_email(recipient_email, recipient_name, service_type, date, time, tracking_id):
+    """Send appointment confirmation email"""
+    
+    subject = f"Appointment Confirmed - {service_type}"
+    
+    html_content = APPOINTMENT_CONFIRMATION_TEMPLATE.render(
+        date=date,
+        recipient_name=recipient_name,
+        service_type=service_type,
+        time=time,
+        tracking_id=tracking_id
+    )
     
     return send_email(recipient_email, subject, html_content)
 
-def send_message_reply(recipient_email, recipient_name, subject, message_body, original_message):
-    """Send reply to contact message"""
-    
-    html_content = f"""
+MESSAGE_REPLY_TEMPLATE = EmailTemplate("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #3b82f6, #2563eb); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; }}
-            .footer {{ background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }}
-            .message-box {{ background: white; padding: 20px; border-radius: 8px; margin: 20px 0; line-height: 1.8; }}
-            .original-message {{ background: #f3f4f6; padding: 15px; border-left: 4px solid #9ca3af; margin: 20px 0; font-size: 14px; }}
-            h1 {{ margin: 0; font-size: 24px; }}
-            h2 {{ color: #3b82f6; font-size: 20px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #3b82f6, #2563eb); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; }
+            .footer { background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }
+            .message-box { background: white; padding: 20px; border-radius: 8px; margin: 20px 0; line-height: 1.8; }
+            .original-message { background: #f3f4f6; padding: 15px; border-left: 4px solid #9ca3af; margin: 20px 0; font-size: 14px; }
+            h1 { margin: 0; font-size: 24px; }
+            h2 { color: #3b82f6; font-size: 20px; }
         </style>
     </head>
     <body>
@@ -294,16 +483,16 @@ def send_message_reply(recipient_email, recipient_name, subject, message_body, o
                 <h1>📧 Message from Barangay NIT</h1>
             </div>
             <div class="content">
-                <h2>Dear {recipient_name},</h2>
+                <h2>Dear $recipient_name,</h2>
                 <p>Thank you for contacting Barangay NIT. Here is our response to your inquiry:</p>
                 
                 <div class="message-box">
-                    {message_body.replace(chr(10), '<br>')}
+                    $message_body
                 </div>
                 
                 <div class="original-message">
                     <strong>Your Original Message:</strong><br><br>
-                    {original_message.replace(chr(10), '<br>')}
+                    $original_message
                 </div>
                 
                 <p>If you have any additional questions, please feel free to contact us.</p>
@@ -329,30 +518,34 @@ def send_message_reply(recipient_email, recipient_name, subject, message_body, o
         </div>
     </body>
     </html>
-    """
-    
-    return send_email(recipient_email, subject, html_content)
+    """, multiline=('message_body', 'original_message',))
 
-def send_certificate_request_received_email(recipient_email, recipient_name, certificate_type, tracking_id):
-    """Send confirmation email when certificate request is received"""
+def send_message_reply(recipient_email, recipient_name, subject, message_body, original_message):
+    """Send reply to contact message"""
     
-    subject = f"Certificate Request Received - {certificate_type}"
+    html_content = MESSAGE_REPLY_TEMPLATE.render(
+        message_body=message_body,
+        original_message=original_message,
+        recipient_name=recipient_name
+    )
     
-    html_content = f"""
+    return send_email(recipient_email, subject, html_content)
+
+CERTIFICATE_RECEIVED_TEMPLATE = EmailTemplate("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #A100FF, #6B00B8); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; }}
-            .footer {{ background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }}
-            .info-box {{ background: white; padding: 15px; border-left: 4px solid #A100FF; margin: 20px 0; }}
-            .tracking-box {{ background: #A100FF; color: white; padding: 20px; text-align: center; border-radius: 8px; margin: 20px 0; }}
-            .tracking-id {{ font-size: 24px; font-weight: bold; letter-spacing: 2px; }}
-            h1 {{ margin: 0; font-size: 24px; }}
-            h2 {{ color: #A100FF; font-size: 20px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #A100FF, #6B00B8); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; }
+            .footer { background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }
+            .info-box { background: white; padding: 15px; border-left: 4px solid #A100FF; margin: 20px 0; }
+            .tracking-box { background: #A100FF; color: white; padding: 20px; text-align: center; border-radius: 8px; margin: 20px 0; }
+            .tracking-id { font-size: 24px; font-weight: bold; letter-spacing: 2px; }
+            h1 { margin: 0; font-size: 24px; }
+            h2 { color: #A100FF; font-size: 20px; }
         </style>
     </head>
     <body>
@@ -361,19 +554,19 @@ def send_certificate_request_received_email(recipient_email, recipient_name, cer
                 <h1>✅ Request Received!</h1>
             </div>
             <div class="content">
-                <h2>Dear {recipient_name},</h2>
+                <h2>Dear $recipient_name,</h2>
                 <p>Thank you for submitting your certificate request online. We have received your application and it is now being processed.</p>
                 
                 <div class="info-box">
                     <strong>Request Details:</strong><br>
-                    <strong>Certificate Type:</strong> {certificate_type}<br>
+                    <strong>Certificate Type:</strong> $certificate_type<br>
                     <strong>Status:</strong> <span style="color: #f59e0b;">Pending Review</span><br>
                     <strong>Submitted:</strong> Just now
                 </div>
                 
                 <div class="tracking-box">
                     <p style="margin: 0 0 10px 0; font-size: 14px;">Your Tracking ID:</p>
-                    <div class="tracking-id">{tracking_id}</div>
+                    <div class="tracking-id">$tracking_id</div>
                     <p style="margin: 10px 0 0 0; font-size: 12px;">Save this ID to track your request</p>
                 </div>
                 
@@ -409,30 +602,36 @@ def send_certificate_request_received_email(recipient_email, recipient_name, cer
         </div>
     </body>
     </html>
-    """
-    
-    return send_email(recipient_email, subject, html_content)
+    """)
 
-def send_appointment_request_received_email(recipient_email, recipient_name, service_type, date, time, tracking_id):
-    """Send confirmation email when appointment request is received"""
+def send_certificate_request_received_email(recipient_email, recipient_name, certificate_type, tracking_id):
+    """Send confirmation email when certificate request is received"""
     
-    subject = f"Appointment Request Received - {service_type}"
+    subject = f"Certificate Request Received - {certificate_type}"
     
-    html_content = f"""
+    html_content = CERTIFICATE_RECEIVED_TEMPLATE.render(
+        certificate_type=certificate_type,
+        recipient_name=recipient_name,
+        tracking_id=tracking_id
+    )
+    
+    return send_email(recipient_email, subject, html_content)
+
+APPOINTMENT_RECEIVED_TEMPLATE = EmailTemplate("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #3b82f6, #2563eb); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; }}
-            .footer {{ background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }}
-            .info-box {{ background: white; padding: 15px; border-left: 4px solid #3b82f6; margin: 20px 0; }}
-            .tracking-box {{ background: #3b82f6; color: white; padding: 20px; text-align: center; border-radius: 8px; margin: 20px 0; }}
-            .tracking-id {{ font-size: 24px; font-weight: bold; letter-spacing: 2px; }}
-            h1 {{ margin: 0; font-size: 24px; }}
-            h2 {{ color: #3b82f6; font-size: 20px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #3b82f6, #2563eb); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; }
+            .footer { background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }
+            .info-box { background: white; padding: 15px; border-left: 4px solid #3b82f6; margin: 20px 0; }
+            .tracking-box { background: #3b82f6; color: white; padding: 20px; text-align: center; border-radius: 8px; margin: 20px 0; }
+            .tracking-id { font-size: 24px; font-weight: bold; letter-spacing: 2px; }
+            h1 { margin: 0; font-size: 24px; }
+            h2 { color: #3b82f6; font-size: 20px; }
         </style>
     </head>
     <body>
@@ -441,20 +640,20 @@ def send_appointment_request_received_email(recipient_email, recipient_name, ser
                 <h1>✅ Appointment Request Received!</h1>
             </div>
             <div class="content">
-                <h2>Dear {recipient_name},</h2>
+                <h2>Dear $recipient_name,</h2>
                 <p>Thank you for booking an appointment with Barangay NIT Health Center. We have received your request and it is pending confirmation.</p>
                 
                 <div class="info-box">
                     <strong>Appointment Details:</strong><br>
-                    <strong>Service:</strong> {service_type}<br>
-                    <strong>Requested Date:</strong> {date}<br>
-                    <strong>Requested Time:</strong> {time}<br>
+                    <strong>Service:</strong> $service_type<br>
+                    <strong>Requested Date:</strong> $date<br>
+                    <strong>Requested Time:</strong> $time<br>
                     <strong>Status:</strong> <span style="color: #f59e0b;">Pending Confirmation</span>
                 </div>
                 
                 <div class="tracking-box">
                     <p style="margin: 0 0 10px 0; font-size: 14px;">Your Tracking ID:</p>
-                    <div class="tracking-id">{tracking_id}</div>
+                    <div class="tracking-id">$tracking_id</div>
                     <p style="margin: 10px 0 0 0; font-size: 12px;">Save this ID to track your appointment</p>
                 </div>
                 
@@ -495,6 +694,81 @@ def send_appointment_request_received_email(recipient_email, recipient_name, ser
         </div>
     </body>
     </html>
-    """
+    """)
+
+def send_appointment_request_received_email(recipient_email, recipient_name, service_type, date, time, tracking_id):
+    """Send confirmation email when appointment request is received"""
+    
+    subject = f"Appointment Request Received - {service_type}"
+    
+    html_content = APPOINTMENT_RECEIVED_TEMPLATE.render(
+        date=date,
+        recipient_name=recipient_name,
+        service_type=service_type,
+        time=time,
+        tracking_id=tracking_id
+    )
+    
+    return send_email(recipient_email, subject, html_content)
+
+ANNOUNCEMENT_TEMPLATE = EmailTemplate("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #A100FF, #6B00B8); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; }
+            .footer { background: #333; color: white; padding: 20px; text-align: center; border-radius: 0 0 10px 10px; font-size: 12px; }
+            .announcement-box { background: white; padding: 20px; border-left: 4px solid #A100FF; border-radius: 8px; margin: 20px 0; }
+            .category { color: #A100FF; font-size: 12px; font-weight: bold; text-transform: uppercase; }
+            h1 { margin: 0; font-size: 24px; }
+            h2 { color: #A100FF; font-size: 20px; }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>📢 Barangay Announcement</h1>
+            </div>
+            <div class="content">
+                <h2>Dear $recipient_name,</h2>
+                
+                <div class="announcement-box">
+                    <div class="category">$category</div>
+                    <h3>$title</h3>
+                    <p>$excerpt</p>
+                </div>
+                
+                <p>Visit the News section of the Barangay NIT website for the full announcement.</p>
+                
+                <p style="margin-top: 30px;">
+                    Best regards,<br>
+                    <strong>Barangay NIT</strong><br>
+                    Lungsod ng Accenture
+                </p>
+            </div>
+            <div class="footer">
+                <p>Barangay NIT - Lungsod ng Accenture</p>
+                <p>📞 (02) 8123-4567 | 📧 brgynit@gmail.com</p>
+                <p>You are receiving this because you have an account with Barangay NIT.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """, multiline=('excerpt',))
+
+def send_announcement_email(recipient_email, recipient_name, title, category, excerpt):
+    """Send a news announcement to a resident (used by broadcast.py)"""
+    
+    subject = f"Barangay NIT Announcement - {title}"
+    
+    html_content = ANNOUNCEMENT_TEMPLATE.render(
+        category=category,
+        excerpt=excerpt,
+        recipient_name=recipient_name,
+        title=title
+    )
     
     return send_email(recipient_email, subject, html_content)
@@ -0,0 +1,72 @@
+"""
+JSON encoding for API responses
+
+MySQL rows come back with datetime, date, timedelta (TIME columns) and Decimal
+values. AppJSONProvider encodes them in one pass with orjson, so handlers can
+pass rows straight to jsonify instead of converting every field by hand.
+
+Dates are written zone-less ('2025-01-14 09:30:00'), as the admin listings
+always returned them. The public news and "my certificates" endpoints
+returned Flask's RFC 822 dates ('Tue, 14 Jan 2025 09:30:00 GMT'), which the
+site's pages hand to `new Date()`; they keep that format via http_dates().
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_FORMAT = '%Y-%m-%d'
+TIME_FORMAT = '%H:%M:%S'
+
+
+def encode_value(value):
+    """orjson `default` hook for the types it does not encode the way the API expects"""
+    # datetime is a subclass of date, so it must be checked first
+    if isinstance(value, datetime):
+        return value.strftime(DATETIME_FORMAT)
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    if isinstance(value, time):
+        return value.strftime(TIME_FORMAT)
+    if isinstance(value, timedelta):
+        # MySQL TIME columns arrive as timedelta; render as HH:MM:SS
+        total_seconds = int(value.total_seconds())
+        hours, remainder = divmod(total_seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if isinstance(value, Decimal):
+        # COUNT/SUM results are Decimal; keep them numeric in the response
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def http_dates(rows):
+    """Copy of a row (or list of rows) with date/datetime values as RFC 822 strings, as Flask's default encoder wrote them"""
+    if rows is None:
+        return None
+    if isinstance(rows, list):
+        return [http_dates(row) for row in rows]
+    return {key: http_date(value) if isinstance(value, date) else value for key, value in rows.items()}
+
+
+class AppJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, registered as app.json"""
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        # datetime/date/time go through encode_value so they keep the API's formats
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=encode_value, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
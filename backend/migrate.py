@@ -0,0 +1,221 @@
+"""
+Versioned schema migrations for the Barangay NIT database
+
+Usage:
+    python migrate.py            Apply pending migrations (same as `upgrade`)
+    python migrate.py upgrade    Apply pending migrations
+    python migrate.py status     List applied and pending migrations
+    python migrate.py verify     EXPLAIN the hot queries and check each one uses an index
+
+Migrations are the numbered .sql files in migrations/ (e.g. 0002_hot_query_indexes.sql),
+applied in order and recorded in the schema_migrations table.
+"""
+import os
+import re
+import sys
+from mysql.connector import Error, errorcode
+from db import DB_CONFIG, get_db_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# Errors that only mean "this object already exists", so a migration can be
+# re-run against a schema that was (partly) created by hand
+ALREADY_APPLIED_ERRORS = {
+    errorcode.ER_DUP_KEYNAME,       # index already exists
+    errorcode.ER_DUP_FIELDNAME,     # column already exists
+    errorcode.ER_TABLE_EXISTS_ERROR,
+    errorcode.ER_FK_DUP_NAME
+}
+
+# Hot queries from application.py and the table whose access path must use an index.
+# Parameters are placeholders; EXPLAIN only needs their types.
+HOT_QUERIES = [
+    (
+        'track_certificate',
+        """SELECT cr.*, u.first_name, u.last_name, u.email
+           FROM certificate_requests cr
+           JOIN users u ON cr.user_id = u.id
+           WHERE cr.tracking_id = %s""",
+        ('CERT-00000000-0000',),
+        'cr'
+    ),
+    (
+        'track_appointment',
+        """SELECT a.*, u.first_name, u.last_name
+           FROM appointments a
+           JOIN users u ON a.user_id = u.id
+           WHERE a.tracking_id = %s""",
+        ('APPT-00000000-0000',),
+        'a'
+    ),
+    (
+        'get_available_slots',
+        """SELECT slot_time, booked
+           FROM appointment_slots
+           WHERE service_type = %s AND slot_date = %s""",
+        ('General Consultation', '2000-01-01'),
+        'appointment_slots'
+    ),
+    (
+        'get_news (by category)',
+        """SELECT * FROM news_articles
+           WHERE category = %s AND published = TRUE
+           ORDER BY created_at DESC""",
+        ('Announcements',),
+        'news_articles'
+    ),
+    (
+        'get_news (all)',
+        """SELECT * FROM news_articles
+           WHERE published = TRUE
+           ORDER BY created_at DESC""",
+        (),
+        'news_articles'
+    ),
+    (
+        'users by email',
+        "SELECT id FROM users WHERE email = %s",
+        ('nobody@example.com',),
+        'users'
+    )
+]
+
+
+def split_statements(sql):
+    """Split a migration file into statements, dropping `--` comment lines"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def discover_migrations():
+    """Return [(version, name, path)] for every migration file, in version order"""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if match:
+            migrations.append((match.group(1), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute(
+        """CREATE TABLE IF NOT EXISTS schema_migrations (
+               version VARCHAR(4) PRIMARY KEY,
+               name VARCHAR(255) NOT NULL,
+               applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"""
+    )
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row['version'] for row in cursor.fetchall()}
+
+
+def upgrade(connection):
+    """Apply every pending migration in order; stops at the first failure"""
+    cursor = connection.cursor(dictionary=True)
+    ensure_migrations_table(cursor)
+    applied = applied_versions(cursor)
+
+    pending = [m for m in discover_migrations() if m[0] not in applied]
+    if not pending:
+        print("Database is up to date")
+        return True
+
+    for version, name, path in pending:
+        print(f"Applying {version}_{name}...")
+        with open(path, encoding='utf-8') as f:
+            statements = split_statements(f.read())
+
+        for statement in statements:
+            try:
+                cursor.execute(statement)
+                # Drain result sets from data migrations (INSERT ... SELECT etc.)
+                if cursor.with_rows:
+                    cursor.fetchall()
+            except Error as e:
+                if e.errno in ALREADY_APPLIED_ERRORS:
+                    print(f"  skipped (already exists): {e.msg}")
+                    continue
+                connection.rollback()
+                print(f"  failed: {e}")
+                print(f"  statement: {statement}")
+                return False
+
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+            (version, name)
+        )
+        connection.commit()
+        print(f"  done ({len(statements)} statements)")
+
+    return True
+
+
+def status(connection):
+    cursor = connection.cursor(dictionary=True)
+    ensure_migrations_table(cursor)
+    applied = applied_versions(cursor)
+
+    for version, name, _ in discover_migrations():
+        state = 'applied' if version in applied else 'pending'
+        print(f"{version}_{name}: {state}")
+    return True
+
+
+def verify(connection):
+    """EXPLAIN each hot query and check that the target table is read through an index"""
+    cursor = connection.cursor(dictionary=True)
+    all_ok = True
+
+    for label, query, params, table in HOT_QUERIES:
+        cursor.execute(f"EXPLAIN {query}", params)
+        plan = cursor.fetchall()
+
+        row = next((r for r in plan if r.get('table') == table), None)
+        extra = ' '.join(str(r.get('Extra') or '') for r in plan)
+
+        if row and row.get('key'):
+            print(f"OK    {label}: {table} uses index {row['key']} ({row['type']})")
+        elif 'no matching row in const table' in extra:
+            # A unique-index probe that found nothing is resolved before EXPLAIN reports a key
+            print(f"OK    {label}: resolved by a unique index lookup")
+        else:
+            all_ok = False
+            access = f"{row['type']} scan" if row else 'no plan row'
+            print(f"FAIL  {label}: {table} has no index ({access}, possible keys: {row.get('possible_keys') if row else None})")
+
+    if not all_ok:
+        print("Some hot queries are not using an index. Tables with only a handful of rows may "
+              "legitimately be scanned; re-check once they hold production data.")
+    return all_ok
+
+
+COMMANDS = {
+    'upgrade': upgrade,
+    'status': status,
+    'verify': verify
+}
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else 'upgrade'
+    if command not in COMMANDS:
+        print(__doc__)
+        return 2
+
+    connection = get_db_connection()
+    if not connection:
+        print(f"Could not connect to {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+        return 1
+
+    try:
+        return 0 if COMMANDS[command](connection) else 1
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
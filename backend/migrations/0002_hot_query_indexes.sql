@@ -0,0 +1,33 @@
+-- Indexes behind the hot queries in application.py.
+-- The unique indexes fail if the table already holds duplicates; clean those up and re-run.
+
+-- Login, registration and public submissions: WHERE email = %s
+CREATE UNIQUE INDEX uq_users_email ON users (email);
+
+-- Public tracking endpoints: WHERE tracking_id = %s
+CREATE UNIQUE INDEX uq_certificate_requests_tracking_id ON certificate_requests (tracking_id);
+CREATE UNIQUE INDEX uq_appointments_tracking_id ON appointments (tracking_id);
+
+-- get_available_slots: WHERE appointment_date = %s AND service_type = %s AND status != 'cancelled'
+-- GROUP BY appointment_time (covering, grouped in index order)
+CREATE INDEX idx_appointments_slot ON appointments (appointment_date, service_type, appointment_time, status);
+
+-- get_news: WHERE published = TRUE [AND category = %s] ORDER BY created_at DESC
+CREATE INDEX idx_news_published_category_created ON news_articles (published, category, created_at);
+CREATE INDEX idx_news_published_created ON news_articles (published, created_at);
+
+-- Keyset pagination of the admin listings
+CREATE INDEX idx_certificate_requests_created ON certificate_requests (created_at, id);
+CREATE INDEX idx_appointments_schedule ON appointments (appointment_date, appointment_time, id);
+CREATE INDEX idx_contact_messages_created ON contact_messages (created_at, id);
+
+-- Admin listings filtered by status: WHERE status = %s ORDER BY <keyset columns> DESC
+CREATE INDEX idx_certificate_requests_status_created ON certificate_requests (status, created_at, id);
+CREATE INDEX idx_appointments_status_schedule ON appointments (status, appointment_date, appointment_time, id);
+CREATE INDEX idx_contact_messages_status_created ON contact_messages (status, created_at, id);
+
+-- get_user_certificates: WHERE user_id = %s ORDER BY created_at DESC
+CREATE INDEX idx_certificate_requests_user_created ON certificate_requests (user_id, created_at);
+
+-- Dashboard pending count: WHERE status = 'pending'
+CREATE INDEX idx_certificate_requests_status ON certificate_requests (status);
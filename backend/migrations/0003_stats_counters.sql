@@ -0,0 +1,43 @@
+-- Incrementally maintained counters for the admin dashboard and badges.
+-- Rows are keyed by (name, scope); scope is '' for global counters and
+-- 'YYYY-MM-DD' for per-day counters such as appointments_on.
+-- The seed below matches `python counters.py reconcile`.
+
+CREATE TABLE IF NOT EXISTS stats_counters (
+    name VARCHAR(64) NOT NULL,
+    scope VARCHAR(32) NOT NULL DEFAULT '',
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (name, scope)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+DELETE FROM stats_counters;
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'certificates_total', '', COUNT(*) FROM certificate_requests;
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'certificates_pending', '', COUNT(*) FROM certificate_requests WHERE status = 'pending';
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'certificates_approved', '', COUNT(*) FROM certificate_requests WHERE status = 'approved';
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'certificates_rejected', '', COUNT(*) FROM certificate_requests WHERE status = 'rejected';
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'appointments_total', '', COUNT(*) FROM appointments;
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'appointments_pending', '', COUNT(*) FROM appointments WHERE status = 'pending';
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'appointments_on', CAST(appointment_date AS CHAR), COUNT(*)
+FROM appointments
+GROUP BY appointment_date;
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'messages_total', '', COUNT(*) FROM contact_messages;
+
+INSERT INTO stats_counters (name, scope, value)
+SELECT 'messages_unread', '', COUNT(*) FROM contact_messages WHERE status = 'unread';
@@ -0,0 +1,21 @@
+-- Per-slot booking inventory for appointments.
+-- One row per (service, date, time) holding the number of active bookings;
+-- capacity comes from SLOT_CAPACITY / SLOT_CAPACITY_BY_SERVICE (see slots.py).
+-- Rows are created on first booking. The backfill below matches
+-- `python slots.py reconcile`.
+
+CREATE TABLE IF NOT EXISTS appointment_slots (
+    service_type VARCHAR(100) NOT NULL,
+    slot_date DATE NOT NULL,
+    slot_time TIME NOT NULL,
+    booked INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (service_type, slot_date, slot_time)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+DELETE FROM appointment_slots;
+
+INSERT INTO appointment_slots (service_type, slot_date, slot_time, booked)
+SELECT service_type, appointment_date, appointment_time, COUNT(*)
+FROM appointments
+WHERE status != 'cancelled'
+GROUP BY service_type, appointment_date, appointment_time;
@@ -0,0 +1,10 @@
+-- Per-prefix, per-day counters behind tracking IDs (see tracking_ids.py).
+-- New IDs use a 6-digit zero-padded sequence, so they can never collide with
+-- the 4-digit random IDs issued before this migration and need no seeding.
+
+CREATE TABLE IF NOT EXISTS tracking_sequences (
+    prefix VARCHAR(8) NOT NULL,
+    seq_date DATE NOT NULL,
+    last_value INT UNSIGNED NOT NULL,
+    PRIMARY KEY (prefix, seq_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,19 @@
+-- Checkpointed bulk announcement emails (see broadcast.py).
+-- last_user_id is the keyset checkpoint: every user with a smaller id has
+-- been processed. updated_at doubles as the running job's lease.
+
+CREATE TABLE IF NOT EXISTS broadcast_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    news_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    total INT NOT NULL DEFAULT 0,
+    sent INT NOT NULL DEFAULT 0,
+    failed INT NOT NULL DEFAULT 0,
+    last_user_id INT NOT NULL DEFAULT 0,
+    error TEXT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME NULL,
+    INDEX idx_broadcast_jobs_status (status),
+    CONSTRAINT fk_broadcast_jobs_news FOREIGN KEY (news_id) REFERENCES news_articles (id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
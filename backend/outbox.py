@@ -0,0 +1,150 @@
+"""
+In-process outbox for outgoing email
+
+Request handlers enqueue a send and return as soon as their database write
+has committed; a small pool of worker threads delivers the messages, retrying
+failures with exponential backoff. Every job gets an id whose status can be
+polled through the API while it is remembered (OUTBOX_STATUS_TTL seconds).
+Job ids start with the worker's pid, and only that worker knows their status.
+
+The queue lives in the worker process: jobs still queued when the process
+exits are lost. When the queue is full, submit() sends inline instead, so
+bursts slow down rather than drop mail.
+"""
+import itertools
+import os
+import queue
+import random
+import threading
+import time
+from cache import TTLCache
+
+OUTBOX_WORKERS = int(os.getenv('OUTBOX_WORKERS', 2))
+OUTBOX_QUEUE_SIZE = int(os.getenv('OUTBOX_QUEUE_SIZE', 500))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 4))
+OUTBOX_RETRY_DELAY = float(os.getenv('OUTBOX_RETRY_DELAY', 5))  # seconds before the first retry
+OUTBOX_STATUS_TTL = int(os.getenv('OUTBOX_STATUS_TTL', 3600))  # seconds
+
+# Job states
+QUEUED = 'queued'
+SENDING = 'sending'
+RETRYING = 'retrying'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+class Outbox:
+    """Bounded queue of send jobs drained by worker threads"""
+
+    def __init__(self, workers=OUTBOX_WORKERS, maxsize=OUTBOX_QUEUE_SIZE,
+                 max_attempts=OUTBOX_MAX_ATTEMPTS, retry_delay=OUTBOX_RETRY_DELAY):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._jobs = TTLCache(maxsize=10000, ttl=OUTBOX_STATUS_TTL)
+        self._ids = itertools.count(1)
+        self._threads = []
+        self._lock = threading.Lock()
+        self.counts = {SENT: 0, FAILED: 0, 'retries': 0, 'inline': 0}
+
+    def _start(self):
+        # Threads start on first use so importing the app (or forking workers) spawns none
+        with self._lock:
+            if self._threads:
+                return
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'outbox-{n}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, send, *args, kind='email', **kwargs):
+        """
+        Queue send(*args, **kwargs) for delivery and return the job id
+
+        send must return True on success; False or an exception counts as a
+        failed attempt. An exception with a true `permanent` attribute (e.g.
+        email_utils.PermanentEmailError) fails the job without retrying.
+        """
+        self._start()
+        job = {
+            'id': f"{os.getpid()}-{next(self._ids)}",
+            'kind': kind,
+            'status': QUEUED,
+            'attempts': 0,
+            'error': None,
+            'createdAt': time.time(),
+            'updatedAt': time.time()
+        }
+        self._jobs.set(job['id'], job)
+
+        try:
+            self._queue.put_nowait((job, send, args, kwargs))
+        except queue.Full:
+            print(f"Outbox full, sending {kind} job {job['id']} inline")
+            self.counts['inline'] += 1
+            self._attempt(job, send, args, kwargs, retry=False)
+        return job['id']
+
+    def status(self, job_id):
+        """Public view of a job, or None if it is unknown or expired"""
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def stats(self):
+        return {
+            'queued': self._queue.qsize(),
+            'workers': len(self._threads),
+            **self.counts
+        }
+
+    def _work(self):
+        while True:
+            job, send, args, kwargs = self._queue.get()
+            try:
+                self._attempt(job, send, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _attempt(self, job, send, args, kwargs, retry=True):
+        job['status'] = SENDING
+        job['attempts'] += 1
+        job['updatedAt'] = time.time()
+        permanent = False
+        try:
+            ok = send(*args, **kwargs)
+            error = None if ok else 'send returned False'
+        except Exception as e:
+            ok, error = False, str(e)
+            permanent = getattr(e, 'permanent', False)
+
+        job['updatedAt'] = time.time()
+        if ok:
+            job['status'] = SENT
+            job['error'] = None
+            self.counts[SENT] += 1
+            return
+
+        job['error'] = error
+        if permanent or not retry or job['attempts'] >= self.max_attempts:
+            job['status'] = FAILED
+            self.counts[FAILED] += 1
+            print(f"Outbox {job['kind']} job {job['id']} failed after {job['attempts']} attempts: {error}")
+            return
+
+        # Exponential backoff with jitter; the timer re-queues without holding a worker
+        delay = self.retry_delay * 2 ** (job['attempts'] - 1) * random.uniform(0.8, 1.2)
+        job['status'] = RETRYING
+        self.counts['retries'] += 1
+        timer = threading.Timer(delay, self._requeue, (job, send, args, kwargs))
+        timer.daemon = True
+        timer.start()
+
+    def _requeue(self, job, send, args, kwargs):
+        try:
+            self._queue.put_nowait((job, send, args, kwargs))
+        except queue.Full:
+            self._attempt(job, send, args, kwargs)
+
+
+outbox = Outbox()
@@ -5,202 +5,47 @@ from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
+from reportlab import rl_config
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
+import multiprocessing
+import threading
+from string import Formatter
+import io
 import os
+from certificate_layouts import LAYOUTS, STYLES
 
-# Create certificates directory if it doesn't exist
+# Where save_certificate writes PDFs. Certificates are rendered in memory; set
+# CERTIFICATES_PERSIST=false on ephemeral hosts to never write them to disk
 CERTIFICATES_DIR = 'certificates'
-if not os.path.exists(CERTIFICATES_DIR):
-    os.makedirs(CERTIFICATES_DIR)
+CERTIFICATES_PERSIST = os.getenv('CERTIFICATES_PERSIST', 'true').lower() == 'true'
 
-def generate_barangay_clearance(data):
-    """Generate Barangay Clearance Certificate"""
-    filename = f"{CERTIFICATES_DIR}/Barangay_Clearance_{data['tracking_id']}.pdf"
-    
-    c = canvas.Canvas(filename, pagesize=letter)
+# Store page streams as plain Flate data; ASCII85 on top adds a quarter to the size and is slow to encode
+rl_config.useA85 = 0
+
+# Worker processes for batch rendering (render_certificates)
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', os.cpu_count() or 1))
+
+BRAND_COLOR = colors.HexColor('#A100FF')
+
+BACKGROUND_FONTS = ("Helvetica-Bold", "Helvetica")
+
+# certificate type -> (font resource names, PDF operators) of its rendered artwork
+_backgrounds = {}
+
+def _draw_artwork(c, certificate_type):
+    """Header band and text, title, "TO WHOM IT MAY CONCERN", footer band and watermark"""
+    layout = LAYOUTS[certificate_type]
     width, height = letter
-    
-    # Header - Logo and Title
-    c.setFillColor(colors.HexColor('#A100FF'))
-    c.rect(0, height - 120, width, 120, fill=True, stroke=False)
-    
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width/2, height - 50, "BARANGAY NIT")
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height - 70, "Lungsod ng Accenture")
-    c.drawCentredString(width/2, height - 90, "Tel: (02) 8123-4567 | Email: brgynit@gmail.com")
-    
-    # Certificate Title
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", 20)
-    c.drawCentredString(width/2, height - 160, "BARANGAY CLEARANCE")
-    
-    # Certificate Number
-    c.setFont("Helvetica", 10)
-    c.drawString(50, height - 190, f"Certificate No: {data['tracking_id']}")
-    c.drawString(50, height - 205, f"Date Issued: {datetime.now().strftime('%B %d, %Y')}")
-    
-    # Body
-    y_position = height - 260
-    c.setFont("Helvetica", 12)
-    
-    # TO WHOM IT MAY CONCERN
-    c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(width/2, y_position, "TO WHOM IT MAY CONCERN")
-    y_position -= 40
-    
-    # Content
-    c.setFont("Helvetica", 12)
-    content = f"""
-        This is to certify that {data['name']}, of legal age, Filipino citizen, 
-    and a resident of {data.get('address', 'Barangay NIT, Accenture Campus')}, is personally known 
-    to me and is of good moral character and reputation in the community.
-    """
-    
-    lines = content.strip().split('\n')
-    for line in lines:
-        c.drawString(80, y_position, line.strip())
-        y_position -= 20
-    
-    y_position -= 20
-    
-    # Purpose
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, f"PURPOSE: {data.get('purpose', 'For whatever legal purpose it may serve')}")
-    y_position -= 40
-    
-    # Validity
-    c.setFont("Helvetica", 11)
-    c.drawString(80, y_position, "This clearance is valid for Six (6) months from the date of issue unless")
-    y_position -= 15
-    c.drawString(80, y_position, "revoked or cancelled for any violation of existing laws or ordinances.")
-    y_position -= 60
-    
-    # Signatures
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Issued by:")
-    c.drawString(400, y_position, "Certified by:")
-    y_position -= 40
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, "_____________________________")
-    c.drawString(400, y_position, "_____________________________")
-    y_position -= 15
-    
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Barangay Secretary")
-    c.drawString(400, y_position, "Barangay Captain")
-    y_position -= 5
-    c.drawString(80, y_position, "MARIA T. SANTOS")
-    c.drawString(400, y_position, "JUAN D. DELA CRUZ")
-    
-    # Footer
-    c.setFillColor(colors.HexColor('#A100FF'))
-    c.rect(0, 0, width, 50, fill=True, stroke=False)
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica", 8)
-    c.drawCentredString(width/2, 25, "This is a computer-generated certificate. No signature required.")
-    c.drawCentredString(width/2, 15, f"Tracking ID: {data['tracking_id']}")
-    
-    # Watermark
-    c.setFillColorRGB(0.9, 0.9, 0.9)
-    c.setFont("Helvetica-Bold", 60)
     c.saveState()
-    c.translate(width/2, height/2)
-    c.rotate(45)
-    c.drawCentredString(0, 0, "OFFICIAL")
-    c.restoreState()
-    
-    c.save()
-    return filename
 
-def generate_certificate_of_indigency(data):
-    """Generate Certificate of Indigency"""
-    filename = f"{CERTIFICATES_DIR}/Certificate_Indigency_{data['tracking_id']}.pdf"
-    
-    c = canvas.Canvas(filename, pagesize=letter)
-    width, height = letter
-    
-    # Header
-    c.setFillColor(colors.HexColor('#A100FF'))
-    c.rect(0, height - 120, width, 120, fill=True, stroke=False)
-    
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width/2, height - 50, "BARANGAY NIT")
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height - 70, "Lungsod ng Accenture")
-    c.drawCentredString(width/2, height - 90, "Office of the Barangay Captain")
-    
-    # Title
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", 20)
-    c.drawCentredString(width/2, height - 160, "CERTIFICATE OF INDIGENCY")
-    
-    # Certificate Number
-    c.setFont("Helvetica", 10)
-    c.drawString(50, height - 190, f"Certificate No: {data['tracking_id']}")
-    c.drawString(50, height - 205, f"Date Issued: {datetime.now().strftime('%B %d, %Y')}")
-    
-    # Body
-    y_position = height - 260
-    
-    c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(width/2, y_position, "TO WHOM IT MAY CONCERN")
-    y_position -= 40
-    
-    c.setFont("Helvetica", 12)
-    content = f"""
-        This is to certify that {data['name']}, of legal age, Filipino, 
-    and a bonafide resident of Barangay NIT, Accenture Campus, belongs to the indigent 
-    families of this Barangay as per record of the Barangay Social Welfare Office.
-    """
-    
-    lines = content.strip().split('\n')
-    for line in lines:
-        c.drawString(80, y_position, line.strip())
-        y_position -= 20
-    
-    y_position -= 20
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, f"PURPOSE: {data.get('purpose', 'Medical/Educational/Financial Assistance')}")
-    y_position -= 40
-    
-    c.setFont("Helvetica", 11)
-    c.drawString(80, y_position, "Issued upon the request of the above-named person for whatever legal")
-    y_position -= 15
-    c.drawString(80, y_position, "purpose it may serve.")
-    y_position -= 60
-    
-    # Signatures
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Issued by:")
-    c.drawString(400, y_position, "Certified by:")
-    y_position -= 40
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, "_____________________________")
-    c.drawString(400, y_position, "_____________________________")
-    y_position -= 15
-    
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Barangay Social Welfare Officer")
-    c.drawString(400, y_position, "Barangay Captain")
-    
-    # Footer
-    c.setFillColor(colors.HexColor('#A100FF'))
-    c.rect(0, 0, width, 50, fill=True, stroke=False)
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica", 8)
-    c.drawCentredString(width/2, 25, "This is a computer-generated certificate.")
-    c.drawCentredString(width/2, 15, f"Tracking ID: {data['tracking_id']}")
-    
-    # Watermark
+    # Watermark first so the page content stays on top of it
     c.setFillColorRGB(0.9, 0.9, 0.9)
     c.setFont("Helvetica-Bold", 60)
     c.saveState()
@@ -208,217 +53,281 @@ def generate_certificate_of_indigency(data):
     c.rotate(45)
     c.drawCentredString(0, 0, "OFFICIAL")
     c.restoreState()
-    
-    c.save()
-    return filename
 
-def generate_certificate_of_residency(data):
-    """Generate Certificate of Residency"""
-    filename = f"{CERTIFICATES_DIR}/Certificate_Residency_{data['tracking_id']}.pdf"
-    
-    c = canvas.Canvas(filename, pagesize=letter)
-    width, height = letter
-    
     # Header
-    c.setFillColor(colors.HexColor('#A100FF'))
+    c.setFillColor(BRAND_COLOR)
     c.rect(0, height - 120, width, 120, fill=True, stroke=False)
-    
     c.setFillColor(colors.white)
     c.setFont("Helvetica-Bold", 24)
     c.drawCentredString(width/2, height - 50, "BARANGAY NIT")
     c.setFont("Helvetica", 12)
     c.drawCentredString(width/2, height - 70, "Lungsod ng Accenture")
-    c.drawCentredString(width/2, height - 90, "Office of the Barangay Captain")
-    
+    c.drawCentredString(width/2, height - 90, layout['office_line'])
+
     # Title
     c.setFillColor(colors.black)
     c.setFont("Helvetica-Bold", 20)
-    c.drawCentredString(width/2, height - 160, "CERTIFICATE OF RESIDENCY")
-    
-    # Certificate Number
-    c.setFont("Helvetica", 10)
-    c.drawString(50, height - 190, f"Certificate No: {data['tracking_id']}")
-    c.drawString(50, height - 205, f"Date Issued: {datetime.now().strftime('%B %d, %Y')}")
-    
-    # Body
-    y_position = height - 260
-    
+    c.drawCentredString(width/2, height - 160, layout['title'])
     c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(width/2, y_position, "TO WHOM IT MAY CONCERN")
-    y_position -= 40
-    
-    c.setFont("Helvetica", 12)
-    content = f"""
-        This is to certify that {data['name']}, of legal age, Filipino citizen, 
-    is a bonafide resident of Barangay NIT, {data.get('address', 'Accenture Campus')} 
-    as shown in the records of this Barangay.
-    """
-    
-    lines = content.strip().split('\n')
-    for line in lines:
-        c.drawString(80, y_position, line.strip())
-        y_position -= 20
-    
-    y_position -= 20
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, f"PURPOSE: {data.get('purpose', 'For whatever legal purpose it may serve')}")
-    y_position -= 40
-    
-    c.setFont("Helvetica", 11)
-    c.drawString(80, y_position, "Issued upon the request of the above-named person this")
-    y_position -= 15
-    c.drawString(80, y_position, f"{datetime.now().strftime('%d day of %B, %Y')} at Barangay NIT, Accenture Campus.")
-    y_position -= 60
-    
-    # Signatures
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Issued by:")
-    c.drawString(400, y_position, "Certified by:")
-    y_position -= 40
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, "_____________________________")
-    c.drawString(400, y_position, "_____________________________")
-    y_position -= 15
-    
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Barangay Secretary")
-    c.drawString(400, y_position, "Barangay Captain")
-    
+    c.drawCentredString(width/2, height - 260, "TO WHOM IT MAY CONCERN")
+
     # Footer
-    c.setFillColor(colors.HexColor('#A100FF'))
+    c.setFillColor(BRAND_COLOR)
     c.rect(0, 0, width, 50, fill=True, stroke=False)
     c.setFillColor(colors.white)
     c.setFont("Helvetica", 8)
-    c.drawCentredString(width/2, 25, "This is a computer-generated certificate.")
-    c.drawCentredString(width/2, 15, f"Tracking ID: {data['tracking_id']}")
-    
-    # Watermark
-    c.setFillColorRGB(0.9, 0.9, 0.9)
-    c.setFont("Helvetica-Bold", 60)
-    c.saveState()
-    c.translate(width/2, height/2)
-    c.rotate(45)
-    c.drawCentredString(0, 0, "OFFICIAL")
+    c.drawCentredString(width/2, 25, layout['footer_note'])
+
     c.restoreState()
-    
-    c.save()
-    return filename
 
-def generate_business_permit_clearance(data):
-    """Generate Business Permit Clearance"""
-    filename = f"{CERTIFICATES_DIR}/Business_Clearance_{data['tracking_id']}.pdf"
-    
-    c = canvas.Canvas(filename, pagesize=letter)
+def _font_names(c):
+    # Registers the artwork's fonts with the document and returns their resource names
+    return tuple(c._doc.getInternalFontName(font) for font in BACKGROUND_FONTS)
+
+def background_operators(certificate_type):
+    """
+    The artwork for a certificate type as raw PDF page operators
+
+    Rendered once per type on a scratch canvas and cached; returns
+    (font resource names, operators).
+    """
+    background = _backgrounds.get(certificate_type)
+    if background is None:
+        scratch = canvas.Canvas(io.BytesIO(), pagesize=letter)
+        fonts = _font_names(scratch)
+        _draw_artwork(scratch, certificate_type)
+        background = (fonts, '\n'.join(scratch._code))
+        _backgrounds[certificate_type] = background
+    return background
+
+def draw_background(c, certificate_type):
+    """Put a certificate type's static artwork on the page, replaying the cached operators"""
+    fonts, operators = background_operators(certificate_type)
+    if _font_names(c) == fonts:
+        c.addLiteral(operators)
+    else:
+        # The canvas numbered its fonts differently; the cached operators would point at the wrong ones
+        _draw_artwork(c, certificate_type)
+
+# Body text column
+TEXT_LEFT = 80
+TEXT_WIDTH = letter[0] - 2 * TEXT_LEFT
+SIGNATURE_COLUMNS = (80, 400)
+
+# certificate type -> compiled draw plan
+_plans = {}
+
+@lru_cache(maxsize=8192)
+def _text_width(text, font, size):
+    return stringWidth(text, font, size)
+
+def wrap_text(text, font, size, max_width=TEXT_WIDTH):
+    """Split text into lines no wider than max_width points; a single overlong word gets its own line"""
+    space = _text_width(' ', font, size)
+    lines = []
+    words = []
+    line_width = 0
+    for word in text.split():
+        word_width = _text_width(word, font, size)
+        if words and line_width + space + word_width > max_width:
+            lines.append(' '.join(words))
+            words, line_width = [word], word_width
+        else:
+            line_width += word_width + (space if words else 0)
+            words.append(word)
+    if words:
+        lines.append(' '.join(words))
+    return lines
+
+def _has_fields(text):
+    return any(field for _, field, _, _ in Formatter().parse(text))
+
+def compile_layout(layout):
+    """
+    Turn a layout from certificate_layouts into a flat list of draw operations
+
+    Static text is wrapped here, once; text with {fields} is wrapped when
+    the certificate is rendered. y positions are relative to a cursor that
+    moves down the page.
+    """
     width, height = letter
-    
-    # Header
-    c.setFillColor(colors.HexColor('#A100FF'))
-    c.rect(0, height - 120, width, 120, fill=True, stroke=False)
-    
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width/2, height - 50, "BARANGAY NIT")
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width/2, height - 70, "Lungsod ng Accenture")
-    c.drawCentredString(width/2, height - 90, "Business Permits and Licensing Office")
-    
-    # Title
-    c.setFillColor(colors.black)
-    c.setFont("Helvetica-Bold", 20)
-    c.drawCentredString(width/2, height - 160, "BUSINESS PERMIT CLEARANCE")
-    
-    # Certificate Number
-    c.setFont("Helvetica", 10)
-    c.drawString(50, height - 190, f"Clearance No: {data['tracking_id']}")
-    c.drawString(50, height - 205, f"Date Issued: {datetime.now().strftime('%B %d, %Y')}")
-    
-    # Body
-    y_position = height - 260
-    
-    c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(width/2, y_position, "TO WHOM IT MAY CONCERN")
-    y_position -= 40
-    
-    c.setFont("Helvetica", 12)
-    content = f"""
-        This is to certify that {data['name']} has been cleared to operate 
-    a business within the jurisdiction of Barangay NIT, Accenture Campus, subject to 
-    compliance with all applicable laws, ordinances, and regulations.
+    plan = [
+        ('font', "Helvetica", 10),
+        ('text', 50, height - 190, layout['number_label'] + ": {tracking_id}"),
+        ('text', 50, height - 205, "Date Issued: {date_issued}"),
+        ('cursor', height - 300)  # below "TO WHOM IT MAY CONCERN" in the background
+    ]
+
+    for style_name, text in layout['body']:
+        style = STYLES[style_name]
+        plan.append(('font', style['font'], style['size']))
+        if _has_fields(text):
+            plan.append(('wrap', text, style['font'], style['size'], style['leading']))
+        else:
+            for line in wrap_text(text, style['font'], style['size']):
+                plan.append(('line', line))
+                plan.append(('down', style['leading']))
+        plan.append(('down', style['space_after']))
+
+    # Signatures: label, signature line, position title and optional name in each column
+    columns = list(zip(SIGNATURE_COLUMNS, layout['signatures']))
+    plan.append(('font', "Helvetica", 10))
+    plan.extend(('line_at', x, label) for x, (label, _, _) in columns)
+    plan.append(('down', 40))
+    plan.append(('font', "Helvetica-Bold", 12))
+    plan.extend(('line_at', x, "_____________________________") for x, _ in columns)
+    plan.append(('down', 15))
+    plan.append(('font', "Helvetica", 10))
+    plan.extend(('line_at', x, position) for x, (_, position, _) in columns)
+    if any(name for _, _, name in layout['signatures']):
+        plan.append(('down', 12))
+        plan.extend(('line_at', x, name) for x, (_, _, name) in columns if name)
+
+    # Footer text over the background's footer band
+    plan.append(('fill', colors.white))
+    plan.append(('font', "Helvetica", 8))
+    plan.append(('centred', width/2, 15, "Tracking ID: {tracking_id}"))
+    return plan
+
+def certificate_plan(certificate_type):
+    plan = _plans.get(certificate_type)
+    if plan is None:
+        layout = LAYOUTS.get(certificate_type)
+        if layout is None:
+            raise ValueError(f"Unknown certificate type: {certificate_type}")
+        plan = _plans[certificate_type] = compile_layout(layout)
+    return plan
+
+def render_plan(c, plan, values):
+    """Run a compiled plan on a canvas; values fill the {fields} in its text"""
+    y = 0
+    for op in plan:
+        kind = op[0]
+        if kind == 'line':
+            c.drawString(TEXT_LEFT, y, op[1])
+        elif kind == 'down':
+            y -= op[1]
+        elif kind == 'font':
+            c.setFont(op[1], op[2])
+        elif kind == 'line_at':
+            c.drawString(op[1], y, op[2])
+        elif kind == 'wrap':
+            _, text, font, size, leading = op
+            for line in wrap_text(text.format_map(values), font, size):
+                c.drawString(TEXT_LEFT, y, line)
+                y -= leading
+        elif kind == 'text':
+            c.drawString(op[1], op[2], op[3].format_map(values))
+        elif kind == 'centred':
+            c.drawCentredString(op[1], op[2], op[3].format_map(values))
+        elif kind == 'cursor':
+            y = op[1]
+        elif kind == 'fill':
+            c.setFillColor(op[1])
+
+def certificate_filename(certificate_type, tracking_id):
+    """File name of a certificate's PDF, e.g. Barangay_Clearance_CERT-20250114-000042.pdf"""
+    layout = LAYOUTS.get(certificate_type)
+    if layout is None:
+        raise ValueError(f"Unknown certificate type: {certificate_type}")
+    return f"{layout['file_prefix']}_{tracking_id}.pdf"
+
+def render_certificate(certificate_type, data):
     """
-    
-    lines = content.strip().split('\n')
-    for line in lines:
-        c.drawString(80, y_position, line.strip())
-        y_position -= 20
-    
-    y_position -= 20
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, f"PURPOSE: {data.get('purpose', 'Business Registration and Permit Application')}")
-    y_position -= 40
-    
-    c.setFont("Helvetica", 11)
-    c.drawString(80, y_position, "This clearance is valid for one (1) year from the date of issue.")
-    y_position -= 60
-    
-    # Signatures
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Approved by:")
-    c.drawString(400, y_position, "Noted by:")
-    y_position -= 40
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(80, y_position, "_____________________________")
-    c.drawString(400, y_position, "_____________________________")
-    y_position -= 15
-    
-    c.setFont("Helvetica", 10)
-    c.drawString(80, y_position, "Business Permits Officer")
-    c.drawString(400, y_position, "Barangay Captain")
-    
-    # Footer
-    c.setFillColor(colors.HexColor('#A100FF'))
-    c.rect(0, 0, width, 50, fill=True, stroke=False)
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica", 8)
-    c.drawCentredString(width/2, 25, "This is a computer-generated clearance.")
-    c.drawCentredString(width/2, 15, f"Tracking ID: {data['tracking_id']}")
-    
-    # Watermark
-    c.setFillColorRGB(0.9, 0.9, 0.9)
-    c.setFont("Helvetica-Bold", 60)
-    c.saveState()
-    c.translate(width/2, height/2)
-    c.rotate(45)
-    c.drawCentredString(0, 0, "OFFICIAL")
-    c.restoreState()
-    
+    Render a certificate into memory
+
+    Args:
+        certificate_type (str): Type of certificate (a key of certificate_layouts.LAYOUTS)
+        data (dict): Certificate data including name, purpose, tracking_id, etc.
+            issued_at (datetime, optional) sets the issue date; defaults to now.
+
+    Returns:
+        tuple: (file name, PDF bytes)
+    """
+    plan = certificate_plan(certificate_type)
+    layout = LAYOUTS[certificate_type]
+
+    issued_at = data.get('issued_at') or datetime.now()
+    values = {
+        **layout['defaults'],
+        **data,
+        'date_issued': issued_at.strftime('%B %d, %Y'),
+        'day_issued': issued_at.strftime('%d day of %B, %Y')
+    }
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    draw_background(c, certificate_type)
+    render_plan(c, plan, values)
     c.save()
-    return filename
+    return certificate_filename(certificate_type, data['tracking_id']), buffer.getvalue()
+
+def save_certificate(filename, pdf_bytes):
+    """Write a rendered certificate to CERTIFICATES_DIR and return its path"""
+    os.makedirs(CERTIFICATES_DIR, exist_ok=True)
+    path = os.path.join(CERTIFICATES_DIR, filename)
+    with open(path, 'wb') as file:
+        file.write(pdf_bytes)
+    return path
 
 def generate_certificate(certificate_type, data):
     """
-    Generate certificate based on type
-    
-    Args:
-        certificate_type (str): Type of certificate
-        data (dict): Certificate data including name, purpose, tracking_id, etc.
+    Generate certificate based on type and save it to CERTIFICATES_DIR
     
     Returns:
         str: Path to generated PDF file
     """
-    certificate_generators = {
-        'Barangay Clearance': generate_barangay_clearance,
-        'Certificate of Indigency': generate_certificate_of_indigency,
-        'Certificate of Residency': generate_certificate_of_residency,
-        'Business Permit Clearance': generate_business_permit_clearance
-    }
-    
-    generator = certificate_generators.get(certificate_type)
-    
-    if generator:
-        return generator(data)
-    else:
-        raise ValueError(f"Unknown certificate type: {certificate_type}")
+    return save_certificate(*render_certificate(certificate_type, data))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _render_pool():
+    # Created on first batch; 'spawn' so workers never inherit the web process's
+    # threads, locks or open database connections
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+def _reset_render_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def render_certificates(jobs):
+    """
+    Render many certificates in memory, in parallel on a pool of PDF_WORKERS processes
+
+    Args:
+        jobs (list): (certificate_type, data) pairs, as for render_certificate
+
+    Returns:
+        list: ((file name, PDF bytes), None) or (None, error message) for each job, in order
+    """
+    if len(jobs) <= 1 or PDF_WORKERS <= 1:
+        results = []
+        for certificate_type, data in jobs:
+            try:
+                results.append((render_certificate(certificate_type, data), None))
+            except Exception as e:
+                results.append((None, str(e)))
+        return results
+
+    pool = _render_pool()
+    futures = [pool.submit(render_certificate, certificate_type, data) for certificate_type, data in jobs]
+    results = []
+    for future in futures:
+        try:
+            results.append((future.result(), None))
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); start a fresh pool for the next batch
+            _reset_render_pool(pool)
+            results.append((None, f"PDF worker crashed: {e}"))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
@@ -0,0 +1,48 @@
+"""
+Resident accounts for public (no login) submissions
+
+Public certificate requests and appointment bookings identify the resident
+by email. get_or_create_resident resolves that to a users.id with a single
+upsert on the unique email index, and remembers the answer per worker so
+repeat submitters skip the query entirely.
+"""
+import os
+from cache import TTLCache
+
+RESIDENT_CACHE_TTL = int(os.getenv('RESIDENT_CACHE_TTL', 600))  # seconds
+
+resident_cache = TTLCache(maxsize=int(os.getenv('RESIDENT_CACHE_SIZE', 4096)), ttl=RESIDENT_CACHE_TTL)
+
+
+def split_name(name):
+    """'Juan Dela Cruz' -> ('Juan', 'Dela Cruz')"""
+    name_parts = name.split()
+    first_name = name_parts[0] if name_parts else ''
+    last_name = ' '.join(name_parts[1:])
+    return first_name, last_name
+
+
+def get_or_create_resident(tx, email, name, phone=''):
+    """
+    Return the id of the user with this email, creating a resident account if needed
+
+    Runs inside the caller's transaction. An existing account is returned as
+    is (its name and phone are not overwritten). Concurrent submissions from
+    the same new email both land on one row thanks to the unique email index.
+    """
+    key = email.strip().lower()
+    user_id = resident_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    first_name, last_name = split_name(name)
+    # On a duplicate email, LAST_INSERT_ID(id) makes the existing id come back as the insert id
+    user_id = tx.execute(
+        """INSERT INTO users (email, first_name, last_name, phone, role)
+           VALUES (%s, %s, %s, %s, 'resident')
+           ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)""",
+        (email, first_name, last_name, phone)
+    )
+    # Only cache ids that are known to exist, i.e. after the transaction commits
+    tx.after_commit(lambda: resident_cache.set(key, user_id))
+    return user_id
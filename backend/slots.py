@@ -0,0 +1,173 @@
+"""
+Appointment slot inventory
+
+appointment_slots keeps one row per (service, date, time) with the number of
+active bookings, so availability is a primary-key range read and booking
+reserves a place with a single conditional UPDATE inside the insert
+transaction. Concurrent bookings for the last place serialize on the slot row
+and only one of them succeeds.
+
+Capacity per slot defaults to SLOT_CAPACITY and can be overridden per service
+with SLOT_CAPACITY_BY_SERVICE, e.g. "Vaccination=5,Prenatal Checkup=2".
+
+Usage:
+    python slots.py reconcile    Recompute booked counts from the appointments table
+"""
+import os
+import sys
+from datetime import timedelta
+from db import execute_query, transaction
+
+SLOT_CAPACITY = int(os.getenv('SLOT_CAPACITY', 3))
+
+# Bookable times: every half hour from 9:00 AM to 4:30 PM
+SLOT_TIMES = tuple(f"{hour:02d}:{minute:02d}:00" for hour in range(9, 17) for minute in (0, 30))
+
+# Longest date range one availability request may cover
+MAX_AVAILABILITY_DAYS = 62
+
+
+def _parse_capacities(value):
+    capacities = {}
+    for item in value.split(','):
+        if '=' in item:
+            service, capacity = item.rsplit('=', 1)
+            capacities[service.strip()] = int(capacity)
+    return capacities
+
+
+SERVICE_CAPACITY = _parse_capacities(os.getenv('SLOT_CAPACITY_BY_SERVICE', ''))
+
+RECONCILE_STATEMENTS = [
+    "DELETE FROM appointment_slots",
+    """INSERT INTO appointment_slots (service_type, slot_date, slot_time, booked)
+       SELECT service_type, appointment_date, appointment_time, COUNT(*)
+       FROM appointments
+       WHERE status != 'cancelled'
+       GROUP BY service_type, appointment_date, appointment_time"""
+]
+
+
+class SlotUnavailableError(Exception):
+    """Raised when a booking targets a slot that is full or not on the schedule"""
+
+
+def capacity_for(service):
+    return SERVICE_CAPACITY.get(service, SLOT_CAPACITY)
+
+
+def normalize_slot_time(value):
+    """Return 'HH:MM:SS' for a slot given as 'HH:MM', 'HH:MM:SS' or a MySQL TIME timedelta"""
+    if hasattr(value, 'total_seconds'):
+        total_seconds = int(value.total_seconds())
+        return f"{total_seconds // 3600:02d}:{total_seconds % 3600 // 60:02d}:{total_seconds % 60:02d}"
+    parts = str(value).split(':')
+    if len(parts) == 2:
+        parts.append('00')
+    try:
+        return ':'.join(f"{int(part):02d}" for part in parts)
+    except ValueError:
+        return str(value)
+
+
+def reserve(tx, service, slot_date, slot_time):
+    """
+    Take one place in a slot inside an open transaction
+
+    Raises SlotUnavailableError if the time is not a bookable slot or the slot
+    is already at capacity; the caller's transaction then rolls back.
+    """
+    slot_time = normalize_slot_time(slot_time)
+    if slot_time not in SLOT_TIMES:
+        raise SlotUnavailableError(f"{slot_time} is not a bookable time")
+
+    tx.execute(
+        """INSERT IGNORE INTO appointment_slots (service_type, slot_date, slot_time, booked)
+           VALUES (%s, %s, %s, 0)""",
+        (service, slot_date, slot_time)
+    )
+    tx.execute(
+        """UPDATE appointment_slots
+           SET booked = booked + 1
+           WHERE service_type = %s AND slot_date = %s AND slot_time = %s
+           AND booked < %s""",
+        (service, slot_date, slot_time, capacity_for(service))
+    )
+    if tx.rowcount == 0:
+        raise SlotUnavailableError(f"{slot_date} {slot_time} is fully booked")
+
+
+def available_slots(service, slot_date):
+    """Slot times with at least one free place, or None if the DB is unavailable"""
+    rows = execute_query(
+        """SELECT slot_time, booked
+           FROM appointment_slots
+           WHERE service_type = %s AND slot_date = %s""",
+        (service, slot_date),
+        fetch=True
+    )
+    if rows is None:
+        return None
+
+    capacity = capacity_for(service)
+    booked = {normalize_slot_time(row['slot_time']): row['booked'] for row in rows}
+    return [slot for slot in SLOT_TIMES if booked.get(slot, 0) < capacity]
+
+
+def availability_range(service, start, end):
+    """
+    Per-day availability for every date from start to end (inclusive)
+
+    One indexed range read returns only the full slots; every other slot in
+    SLOT_TIMES is free. Returns None if the DB is unavailable.
+    """
+    rows = execute_query(
+        """SELECT slot_date, slot_time
+           FROM appointment_slots
+           WHERE service_type = %s AND slot_date BETWEEN %s AND %s
+           AND booked >= %s
+           ORDER BY slot_date, slot_time""",
+        (service, start, end, capacity_for(service)),
+        fetch=True
+    )
+    if rows is None:
+        return None
+
+    full = {}
+    for row in rows:
+        full.setdefault(row['slot_date'], []).append(normalize_slot_time(row['slot_time']))
+
+    days = []
+    day = start
+    while day <= end:
+        full_slots = [slot for slot in full.get(day, []) if slot in SLOT_TIMES]
+        available = len(SLOT_TIMES) - len(full_slots)
+        days.append({
+            'date': day,
+            'availableSlots': available,
+            'fullSlots': full_slots,
+            'fullyBooked': available == 0
+        })
+        day += timedelta(days=1)
+    return days
+
+
+def reconcile():
+    """Rebuild appointment_slots from the appointments table"""
+    with transaction() as tx:
+        for statement in RECONCILE_STATEMENTS:
+            tx.execute(statement)
+    print("appointment_slots reconciled")
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else None
+    if command != 'reconcile':
+        print(__doc__)
+        return 2
+    reconcile()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
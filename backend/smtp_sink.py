@@ -0,0 +1,155 @@
+"""
+Local SMTP sink for development, benchmarks and CI
+
+Accepts every message and throws it away, counting messages and bytes. It
+speaks just enough SMTP for smtplib (EHLO/HELO, AUTH PLAIN/LOGIN, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT) and needs no network access beyond localhost.
+There is no STARTTLS, so point the app at it with EMAIL_USE_TLS=false.
+
+Usage:
+    python smtp_sink.py [port]    Run a sink on 127.0.0.1 (default port 1025)
+
+In-process:
+    sink = SMTPSink().start()     # port 0 picks a free port; see sink.port
+    ...
+    sink.stop()
+"""
+import socketserver
+import sys
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def _readline(self):
+        line = self.rfile.readline()
+        self.server.sink._count_bytes(len(line))
+        return line
+
+    def handle(self):
+        sink = self.server.sink
+        sink._count_connection()
+        self._reply('220 localhost SMTP sink ready')
+
+        while True:
+            line = self._readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb == 'EHLO':
+                self._reply('250-localhost')
+                self._reply('250-8BITMIME')
+                self._reply('250-SIZE 52428800')
+                self._reply('250 AUTH PLAIN LOGIN')
+            elif verb == 'HELO':
+                self._reply('250 localhost')
+            elif verb == 'AUTH':
+                parts = command.split()
+                mechanism = parts[1].upper() if len(parts) > 1 else ''
+                if mechanism == 'LOGIN':
+                    # Username and password prompts; any credentials are accepted
+                    for _ in range(2 - (len(parts) > 2)):
+                        self._reply('334 VXNlcm5hbWU6')
+                        self._readline()
+                elif mechanism == 'PLAIN' and len(parts) == 2:
+                    self._reply('334 ')
+                    self._readline()
+                self._reply('235 2.7.0 Authentication successful')
+            elif verb in ('MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self._reply('250 OK')
+            elif verb == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                while True:
+                    data_line = self._readline()
+                    if not data_line or data_line in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data_line)
+                sink._count_message(size)
+                self._reply('250 OK: queued')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """Threaded SMTP server on localhost that discards mail and keeps counters"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.host = host
+        self.port = port
+        self._server = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.messages = 0
+            self.message_bytes = 0
+            self.bytes_received = 0
+            self.connections = 0
+
+    def _count_bytes(self, n):
+        with self._lock:
+            self.bytes_received += n
+
+    def _count_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def _count_message(self, size):
+        with self._lock:
+            self.messages += 1
+            self.message_bytes += size
+
+    def stats(self):
+        with self._lock:
+            return {
+                'messages': self.messages,
+                'messageBytes': self.message_bytes,
+                'bytesReceived': self.bytes_received,
+                'connections': self.connections
+            }
+
+    def start(self):
+        self._server = _Server((self.host, self.port), _SMTPHandler)
+        self._server.sink = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name='smtp-sink', daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def main(argv):
+    port = int(argv[1]) if len(argv) > 1 else 1025
+    sink = SMTPSink(port=port).start()
+    print(f"SMTP sink listening on {sink.host}:{sink.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"SMTP sink: {sink.stats()}")
+    except KeyboardInterrupt:
+        sink.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
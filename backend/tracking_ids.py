@@ -0,0 +1,58 @@
+"""
+Tracking ID allocation
+
+Tracking IDs look like CERT-20250114-000042: a prefix, the issue date and a
+per-prefix, per-day sequence number from the tracking_sequences table,
+zero-padded to a fixed width so IDs sort in issue order and date ranges can
+be scanned on the tracking_id index.
+"""
+from datetime import datetime
+from mysql.connector import IntegrityError, errorcode
+from db import execute_query, transaction
+
+SEQUENCE_WIDTH = 6
+INSERT_ATTEMPTS = 3
+
+
+def next_tracking_id(prefix):
+    """
+    Allocate the next tracking ID for prefix
+
+    Runs as its own autocommitted statement so the sequence row is locked only
+    briefly and a number is never handed out twice, even if the caller's
+    insert later rolls back (that number is simply skipped).
+    """
+    today = datetime.now()
+    # LAST_INSERT_ID(expr) makes the new value come back as the statement's insert id
+    value = execute_query(
+        """INSERT INTO tracking_sequences (prefix, seq_date, last_value)
+           VALUES (%s, %s, LAST_INSERT_ID(1))
+           ON DUPLICATE KEY UPDATE last_value = LAST_INSERT_ID(last_value + 1)""",
+        (prefix, today.date())
+    )
+    if not value:
+        raise RuntimeError(f"Could not allocate a {prefix} tracking ID")
+    return f"{prefix}-{today.strftime('%Y%m%d')}-{value:0{SEQUENCE_WIDTH}d}"
+
+
+def is_duplicate_tracking_id(error):
+    return error.errno == errorcode.ER_DUP_ENTRY and 'tracking_id' in str(error.msg)
+
+
+def insert_with_tracking_id(prefix, insert):
+    """
+    Run insert(tx, tracking_id) in a transaction with a freshly allocated ID
+
+    If the tracking_id unique key still rejects the ID (e.g. a row inserted by
+    hand), the transaction rolls back and is retried with the next ID.
+    Returns (tracking_id, whatever insert returned).
+    """
+    for attempt in range(1, INSERT_ATTEMPTS + 1):
+        tracking_id = next_tracking_id(prefix)
+        try:
+            with transaction() as tx:
+                return tracking_id, insert(tx, tracking_id)
+        except IntegrityError as e:
+            if not is_duplicate_tracking_id(e) or attempt == INSERT_ATTEMPTS:
+                raise
+            print(f"Tracking ID {tracking_id} already taken, retrying")
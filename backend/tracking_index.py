@@ -0,0 +1,173 @@
+"""
+Membership filter for tracking IDs
+
+Public tracking endpoints are easy to enumerate (PREFIX-YYYYMMDD-NNNN), and
+every guess used to cost a MySQL round-trip. TrackingIndex keeps a Bloom
+filter of every issued tracking ID plus a short-lived negative cache, so IDs
+that were never issued get a 404 without touching the database.
+
+Each worker builds its own filter and only sees the inserts it handled
+itself, so IDs dated on or after the day before the last rebuild always fall
+through to the database. The filter is first built in the background on the
+first lookup, then rebuilt once it is older than TRACKING_FILTER_REBUILD
+seconds. After a failed rebuild the next attempt waits TRACKING_FILTER_RETRY
+seconds.
+"""
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from cache import TTLCache
+from db import execute_query
+
+TRACKING_FILTER_REBUILD = int(os.getenv('TRACKING_FILTER_REBUILD', 3600))  # seconds
+TRACKING_FILTER_RETRY = int(os.getenv('TRACKING_FILTER_RETRY', 60))  # seconds
+TRACKING_FILTER_ERROR_RATE = float(os.getenv('TRACKING_FILTER_ERROR_RATE', 0.01))
+TRACKING_NEGATIVE_TTL = int(os.getenv('TRACKING_NEGATIVE_TTL', 30))  # seconds
+
+TRACKING_ID_PATTERN = re.compile(r'^(CERT|APPT)-(\d{8})-\d+$')
+
+MIN_CAPACITY = 10000
+
+
+def normalize_tracking_id(tracking_id):
+    """Canonical form of a tracking ID as typed by a resident (surrounding spaces, lower case)"""
+    return tracking_id.strip().upper()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing of one BLAKE2b digest"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TrackingIndex:
+    """Answers "could this tracking ID exist?" without a query for most IDs that don't"""
+
+    def __init__(self, rebuild_interval=TRACKING_FILTER_REBUILD, error_rate=TRACKING_FILTER_ERROR_RATE,
+                 negative_ttl=TRACKING_NEGATIVE_TTL, retry_interval=TRACKING_FILTER_RETRY):
+        self.rebuild_interval = rebuild_interval
+        self.retry_interval = retry_interval
+        self.error_rate = error_rate
+        self._filter = None
+        self._cutoff = None      # IDs dated on or after this YYYYMMDD bypass the filter
+        self._built_at = None
+        self._attempted_at = None
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._missing = TTLCache(maxsize=10000, ttl=negative_ttl)
+        self.rejected = 0
+
+    def rebuild(self):
+        """Load every tracking ID from the database into a fresh filter"""
+        # Anything generated from yesterday on may commit after this scan starts
+        cutoff = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
+        rows = execute_query(
+            """SELECT tracking_id FROM certificate_requests
+               UNION ALL
+               SELECT tracking_id FROM appointments""",
+            fetch=True
+        )
+        if rows is None:
+            print("Tracking filter rebuild failed; lookups will go to the database")
+            return False
+
+        bloom = BloomFilter(max(len(rows) * 2, MIN_CAPACITY), self.error_rate)
+        for row in rows:
+            bloom.add(normalize_tracking_id(row['tracking_id']))
+
+        with self._lock:
+            self._filter = bloom
+            self._cutoff = cutoff
+            self._built_at = time.monotonic()
+        print(f"Tracking filter rebuilt with {len(rows)} IDs")
+        return True
+
+    def refresh(self):
+        """Start a background rebuild if the filter is missing or stale, at most every retry_interval"""
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._built_at is not None and now - self._built_at < self.rebuild_interval
+            backing_off = self._attempted_at is not None and now - self._attempted_at < self.retry_interval
+            if fresh or backing_off or self._rebuilding:
+                return
+            self._rebuilding = True
+            self._attempted_at = now
+
+        def run():
+            try:
+                self.rebuild()
+            except Exception as e:
+                print(f"Error rebuilding tracking filter: {e}")
+            finally:
+                with self._lock:
+                    self._rebuilding = False
+
+        threading.Thread(target=run, name='tracking-filter-rebuild', daemon=True).start()
+
+    def might_exist(self, tracking_id):
+        """False only when the ID is certainly unknown; True means "ask the database\""""
+        tracking_id = normalize_tracking_id(tracking_id)
+        self.refresh()
+
+        if self._missing.get(tracking_id):
+            self.rejected += 1
+            return False
+
+        with self._lock:
+            bloom, cutoff = self._filter, self._cutoff
+        if bloom is None:
+            return True
+
+        match = TRACKING_ID_PATTERN.match(tracking_id)
+        if match and match.group(2) >= cutoff:
+            return True
+        if tracking_id in bloom:
+            return True
+        self.rejected += 1
+        return False
+
+    def add(self, tracking_id):
+        """Record a newly issued tracking ID"""
+        tracking_id = normalize_tracking_id(tracking_id)
+        self._missing.invalidate(tracking_id)
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(tracking_id)
+
+    def remember_missing(self, tracking_id):
+        """Cache a database miss so repeated guesses of the same ID skip the query"""
+        tracking_id = normalize_tracking_id(tracking_id)
+        self._missing.set(tracking_id, True)
+
+    def stats(self):
+        with self._lock:
+            built = self._filter is not None
+            return {
+                'ready': built,
+                'bits': self._filter.size if built else 0,
+                'hashes': self._filter.hash_count if built else 0,
+                'cutoff': self._cutoff,
+                'rejected': self.rejected,
+                'negativeCache': self._missing.stats()
+            }
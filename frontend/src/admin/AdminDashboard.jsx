@@ -11,12 +11,14 @@ import './DashboardFix.css';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
 const API_URL = `${API_BASE_URL}/api`;
+const PAGE_SIZE = 50;
 
 const AdminDashboard = () => {
   const navigate = useNavigate();
   const [activeView, setActiveView] = useState('dashboard');
   const [selectedRequest, setSelectedRequest] = useState(null);
   const [filterStatus, setFilterStatus] = useState('all');
+  const [messagesFilter, setMessagesFilter] = useState('all');
   const [isNewsFormOpen, setIsNewsFormOpen] = useState(false);
   const [editingNews, setEditingNews] = useState(null);
   const [isResidentFormOpen, setIsResidentFormOpen] = useState(false);
@@ -41,11 +43,17 @@ const AdminDashboard = () => {
   const [newsArticles, setNewsArticles] = useState([]);
   const [residents, setResidents] = useState([]);
   const [messages, setMessages] = useState([]);
+  const [nextCursors, setNextCursors] = useState({
+    requests: null,
+    appointments: null,
+    messages: null
+  });
   const [stats, setStats] = useState({
     pending: 0,
     approved: 0,
     rejected: 0,
     appointments: 0,
+    unreadMessages: 0
   });
 
   // Get auth token
@@ -53,13 +61,51 @@ const AdminDashboard = () => {
     return localStorage.getItem('token');
   };
 
-  // Fetch functions
-  const fetchRequests = async () => {
+  // Build the query string for a paginated admin list, filtered by status on the server
+  const pageQuery = (cursor, status = 'all') => {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (cursor) params.set('cursor', cursor);
+    if (status !== 'all') params.set('status', status);
+    return params.toString();
+  };
+
+  // Dashboard counts come from the server, not from the loaded pages
+  const fetchStats = async () => {
+    setLoading(prev => ({ ...prev, stats: true }));
+    setErrors(prev => ({ ...prev, stats: null }));
+
+    try {
+      const response = await fetch(`${API_URL}/admin/dashboard`, {
+        headers: {
+          'Authorization': `Bearer ${getAuthToken()}`
+        }
+      });
+
+      if (!response.ok) throw new Error('Failed to fetch dashboard statistics');
+
+      const data = await response.json();
+      setStats({
+        pending: data.pendingCertificates,
+        approved: data.approvedCertificates,
+        rejected: data.rejectedCertificates,
+        appointments: data.todayAppointments,
+        unreadMessages: data.unreadMessages
+      });
+    } catch (error) {
+      console.error('Error fetching dashboard statistics:', error);
+      setErrors(prev => ({ ...prev, stats: error.message }));
+    } finally {
+      setLoading(prev => ({ ...prev, stats: false }));
+    }
+  };
+
+  // Fetch functions (pass a cursor to append the next page)
+  const fetchRequests = async (cursor = null) => {
     setLoading(prev => ({ ...prev, requests: true }));
     setErrors(prev => ({ ...prev, requests: null }));
     
     try {
-      const response = await fetch(`${API_URL}/certificates/all`, {
+      const response = await fetch(`${API_URL}/certificates/all?${pageQuery(cursor, filterStatus)}`, {
         headers: {
           'Authorization': `Bearer ${getAuthToken()}`
         }
@@ -70,7 +116,7 @@ const AdminDashboard = () => {
       const data = await response.json();
       
       // Transform data to match frontend format
-      const transformedData = data.map(cert => ({
+      const transformedData = data.items.map(cert => ({
         id: cert.id,
         name: `${cert.first_name} ${cert.last_name}`,
         type: cert.certificate_type,
@@ -85,7 +131,8 @@ const AdminDashboard = () => {
         id_file_path: cert.id_file_path
       }));
       
-      setRequests(transformedData);
+      setRequests(prev => cursor ? [...prev, ...transformedData] : transformedData);
+      setNextCursors(prev => ({ ...prev, requests: data.nextCursor }));
     } catch (error) {
       console.error('Error fetching requests:', error);
       setErrors(prev => ({ ...prev, requests: error.message }));
@@ -94,12 +141,12 @@ const AdminDashboard = () => {
     }
   };
 
-  const fetchAppointments = async () => {
+  const fetchAppointments = async (cursor = null) => {
     setLoading(prev => ({ ...prev, appointments: true }));
     setErrors(prev => ({ ...prev, appointments: null }));
     
     try {
-      const response = await fetch(`${API_URL}/appointments/all`, {
+      const response = await fetch(`${API_URL}/appointments/all?${pageQuery(cursor)}`, {
         headers: {
           'Authorization': `Bearer ${getAuthToken()}`
         }
@@ -110,7 +157,7 @@ const AdminDashboard = () => {
       const data = await response.json();
       
       // Transform data to match frontend format
-      const transformedData = data.map(appt => ({
+      const transformedData = data.items.map(appt => ({
         id: appt.id,
         name: `${appt.first_name} ${appt.last_name}`,
         service: appt.service_type,
@@ -122,7 +169,8 @@ const AdminDashboard = () => {
         trackingId: appt.tracking_id
       }));
       
-      setAppointments(transformedData);
+      setAppointments(prev => cursor ? [...prev, ...transformedData] : transformedData);
+      setNextCursors(prev => ({ ...prev, appointments: data.nextCursor }));
     } catch (error) {
       console.error('Error fetching appointments:', error);
       setErrors(prev => ({ ...prev, appointments: error.message }));
@@ -164,12 +212,12 @@ const AdminDashboard = () => {
     }
   };
 
-  const fetchMessages = async () => {
+  const fetchMessages = async (cursor = null) => {
     setLoading(prev => ({ ...prev, messages: true }));
     setErrors(prev => ({ ...prev, messages: null }));
     
     try {
-      const response = await fetch(`${API_URL}/contact/messages`, {
+      const response = await fetch(`${API_URL}/contact/messages?${pageQuery(cursor, messagesFilter)}`, {
         headers: {
           'Authorization': `Bearer ${getAuthToken()}`
         }
@@ -180,7 +228,7 @@ const AdminDashboard = () => {
       const data = await response.json();
       
       // Transform data to match frontend format
-      const transformedData = data.map(msg => ({
+      const transformedData = data.items.map(msg => ({
         id: msg.id,
         name: msg.name,
         email: msg.email,
@@ -192,7 +240,8 @@ const AdminDashboard = () => {
         status: msg.status || 'unread'
       }));
       
-      setMessages(transformedData);
+      setMessages(prev => cursor ? [...prev, ...transformedData] : transformedData);
+      setNextCursors(prev => ({ ...prev, messages: data.nextCursor }));
     } catch (error) {
       console.error('Error fetching messages:', error);
       setErrors(prev => ({ ...prev, messages: error.message }));
@@ -205,17 +254,27 @@ const AdminDashboard = () => {
 
   // Load data on mount
   // eslint-disable-next-line react-hooks/exhaustive-deps
+  // Requests and messages load from the effects below, whenever their status filter changes
   const loadAllData = useCallback(() => {
-    fetchRequests();
+    fetchStats();
     fetchAppointments();
     fetchNews();
-    fetchMessages();
   }, []);
   
   useEffect(() => {
     loadAllData();
   }, [loadAllData]);
 
+  // eslint-disable-next-line react-hooks/exhaustive-deps
+  useEffect(() => {
+    fetchRequests();
+  }, [filterStatus]);
+
+  // eslint-disable-next-line react-hooks/exhaustive-deps
+  useEffect(() => {
+    fetchMessages();
+  }, [messagesFilter]);
+
   // Scroll to top when view changes
   useEffect(() => {
     const contentArea = document.querySelector('.content-area');
@@ -224,27 +283,6 @@ const AdminDashboard = () => {
     }
   }, [activeView]);
 
-  // Update stats when requests change
-  useEffect(() => {
-    const pending = requests.filter(r => r.status === 'pending').length;
-    const approved = requests.filter(r => r.status === 'approved').length;
-    const rejected = requests.filter(r => r.status === 'rejected').length;
-    const todayAppointments = appointments.filter(a => {
-      const today = new Date().toISOString().split('T')[0];
-      return a.date === today && a.status === 'confirmed';
-    }).length;
-    
-    setStats({
-      pending,
-      approved,
-      rejected,
-      appointments: todayAppointments
-    });
-    
-    // Debug log
-    console.log('Dashboard Stats Updated:', { pending, approved, rejected, appointments: todayAppointments });
-  }, [requests, appointments]);
-
   // Handle request actions
   const handleApprove = async (id) => {
     try {
@@ -262,7 +300,7 @@ const AdminDashboard = () => {
       if (!response.ok) throw new Error('Failed to approve request');
 
       // Refresh requests
-      await fetchRequests();
+      await Promise.all([fetchRequests(), fetchStats()]);
       setSelectedRequest(null);
       alert('Certificate approved successfully!');
     } catch (error) {
@@ -288,7 +326,7 @@ const AdminDashboard = () => {
       if (!response.ok) throw new Error('Failed to reject request');
 
       // Refresh requests
-      await fetchRequests();
+      await Promise.all([fetchRequests(), fetchStats()]);
       setSelectedRequest(null);
       alert('Certificate rejected successfully.');
     } catch (error) {
@@ -310,7 +348,7 @@ const AdminDashboard = () => {
       if (!response.ok) throw new Error('Failed to confirm appointment');
 
       // Refresh appointments
-      await fetchAppointments();
+      await Promise.all([fetchAppointments(), fetchStats()]);
       setSelectedRequest(null);
       alert('Appointment confirmed successfully!');
     } catch (error) {
@@ -328,11 +366,6 @@ const AdminDashboard = () => {
     }
   };
 
-  // Filter requests
-  const filteredRequests = filterStatus === 'all' 
-    ? requests 
-    : requests.filter(r => r.status === filterStatus);
-
   return (
     <div className="admin-container">
       {/* Sidebar */}
@@ -385,8 +418,8 @@ const AdminDashboard = () => {
             >
               <MessageSquare size={20} />
               <span>Messages</span>
-              {messages.filter(m => m.status === 'unread').length > 0 && (
-                <span className="nav-badge">{messages.filter(m => m.status === 'unread').length}</span>
+              {stats.unreadMessages > 0 && (
+                <span className="nav-badge">{stats.unreadMessages}</span>
               )}
             </div>
           </div>
@@ -574,7 +607,7 @@ const AdminDashboard = () => {
                   <div className="error-state">
                     <AlertCircle size={32} />
                     <p>Error loading requests: {errors.requests}</p>
-                    <button onClick={fetchRequests} className="btn btn-primary">Retry</button>
+                    <button onClick={() => fetchRequests()} className="btn btn-primary">Retry</button>
                   </div>
                 ) : (
                   <RequestsTable 
@@ -627,13 +660,18 @@ const AdminDashboard = () => {
                 </div>
               ) : (
                 <RequestsTable 
-                  requests={filteredRequests}
+                  requests={requests}
                   onView={setSelectedRequest}
                   onApprove={handleApprove}
                   onReject={handleReject}
                   showTitle={false}
                 />
               )}
+              {nextCursors.requests && !loading.requests && (
+                <button onClick={() => fetchRequests(nextCursors.requests)} className="btn btn-primary">
+                  Load more
+                </button>
+              )}
             </div>
           )}
 
@@ -644,11 +682,18 @@ const AdminDashboard = () => {
                 <p>Loading appointments...</p>
               </div>
             ) : (
-              <AppointmentsTable 
-                appointments={appointments}
-                onView={setSelectedRequest}
-                onConfirm={handleConfirmAppointment}
-              />
+              <>
+                <AppointmentsTable 
+                  appointments={appointments}
+                  onView={setSelectedRequest}
+                  onConfirm={handleConfirmAppointment}
+                />
+                {nextCursors.appointments && (
+                  <button onClick={() => fetchAppointments(nextCursors.appointments)} className="btn btn-primary">
+                    Load more
+                  </button>
+                )}
+              </>
             )
           )}
 
@@ -702,44 +747,54 @@ const AdminDashboard = () => {
                 <p>Loading messages...</p>
               </div>
             ) : (
-              <MessagesManagement 
-                messages={messages}
-                onView={(message) => setSelectedRequest(message)}
-                onDelete={async (id) => {
-                  if (window.confirm('Are you sure you want to delete this message?')) {
+              <>
+                <MessagesManagement 
+                  messages={messages}
+                  filterStatus={messagesFilter}
+                  onFilterChange={setMessagesFilter}
+                  unreadCount={stats.unreadMessages}
+                  onView={(message) => setSelectedRequest(message)}
+                  onDelete={async (id) => {
+                    if (window.confirm('Are you sure you want to delete this message?')) {
+                      try {
+                        const response = await fetch(`${API_URL}/contact/messages/${id}`, {
+                          method: 'DELETE',
+                          headers: {
+                            'Authorization': `Bearer ${getAuthToken()}`
+                          }
+                        });
+                        if (response.ok) {
+                          await Promise.all([fetchMessages(), fetchStats()]);
+                          alert('Message deleted successfully');
+                        }
+                      } catch (error) {
+                        console.error('Error deleting message:', error);
+                        alert('Failed to delete message');
+                      }
+                    }
+                  }}
+                  onMarkRead={async (id) => {
                     try {
-                      const response = await fetch(`${API_URL}/contact/messages/${id}`, {
-                        method: 'DELETE',
+                      const response = await fetch(`${API_URL}/contact/messages/${id}/mark-read`, {
+                        method: 'PUT',
                         headers: {
                           'Authorization': `Bearer ${getAuthToken()}`
                         }
                       });
                       if (response.ok) {
-                        await fetchMessages();
-                        alert('Message deleted successfully');
+                        await Promise.all([fetchMessages(), fetchStats()]);
                       }
                     } catch (error) {
-                      console.error('Error deleting message:', error);
-                      alert('Failed to delete message');
+                      console.error('Error marking message as read:', error);
                     }
-                  }
-                }}
-                onMarkRead={async (id) => {
-                  try {
-                    const response = await fetch(`${API_URL}/contact/messages/${id}/mark-read`, {
-                      method: 'PUT',
-                      headers: {
-                        'Authorization': `Bearer ${getAuthToken()}`
-                      }
-                    });
-                    if (response.ok) {
-                      await fetchMessages();
-                    }
-                  } catch (error) {
-                    console.error('Error marking message as read:', error);
-                  }
-                }}
-              />
+                  }}
+                />
+                {nextCursors.messages && (
+                  <button onClick={() => fetchMessages(nextCursors.messages)} className="btn btn-primary">
+                    Load more
+                  </button>
+                )}
+              </>
             )
           )}
 
@@ -1972,14 +2027,8 @@ const NewsFormModal = ({ article, onClose, onSave }) => {
 };
 
 // Messages Management Component
-const MessagesManagement = ({ messages, onView, onDelete, onMarkRead }) => {
-  const [filterStatus, setFilterStatus] = React.useState('all');
-  
-  const filteredMessages = filterStatus === 'all' 
-    ? messages 
-    : messages.filter(m => m.status === filterStatus);
-  
-  const unreadCount = messages.filter(m => m.status === 'unread').length;
+// messages are already filtered by filterStatus on the server; unreadCount is the dashboard counter
+const MessagesManagement = ({ messages, filterStatus, onFilterChange, unreadCount, onView, onDelete, onMarkRead }) => {
 
   return (
     <div className="table-card">
@@ -2003,25 +2052,25 @@ const MessagesManagement = ({ messages, onView, onDelete, onMarkRead }) => {
         <div className="table-actions">
           <button 
             className={`filter-btn ${filterStatus === 'all' ? 'active' : ''}`}
-            onClick={() => setFilterStatus('all')}
+            onClick={() => onFilterChange('all')}
           >
             All
           </button>
           <button 
             className={`filter-btn ${filterStatus === 'unread' ? 'active' : ''}`}
-            onClick={() => setFilterStatus('unread')}
+            onClick={() => onFilterChange('unread')}
           >
             <Mail size={16} /> Unread
           </button>
           <button 
             className={`filter-btn ${filterStatus === 'read' ? 'active' : ''}`}
-            onClick={() => setFilterStatus('read')}
+            onClick={() => onFilterChange('read')}
           >
             <Check size={16} /> Read
           </button>
         </div>
       </div>
-      {filteredMessages.length > 0 ? (
+      {messages.length > 0 ? (
         <table className="data-table">
           <thead>
             <tr>
@@ -2034,7 +2083,7 @@ const MessagesManagement = ({ messages, onView, onDelete, onMarkRead }) => {
             </tr>
           </thead>
           <tbody>
-            {filteredMessages.map(message => (
+            {messages.map(message => (
               <tr 
                 key={message.id} 
                 style={{ 
@@ -2,6 +2,8 @@ import React, { useState, useEffect } from 'react';
 import { X, Calendar, Send, CheckCircle, AlertCircle } from 'lucide-react';
 import { API_BASE_URL } from '../../config/api';
 
+const NO_AVAILABILITY = { service: null, slotTimes: [], days: {} };
+
 const AppointmentBookingForm = ({ onClose, preselectedService }) => {
   const [formData, setFormData] = useState({
     name: '',
@@ -18,6 +20,8 @@ const AppointmentBookingForm = ({ onClose, preselectedService }) => {
   const [trackingId, setTrackingId] = useState('');
   const [availableSlots, setAvailableSlots] = useState([]);
   const [loadingSlots, setLoadingSlots] = useState(false);
+  // Availability for the whole bookable window of one service, keyed by date
+  const [availability, setAvailability] = useState(NO_AVAILABILITY);
 
   const services = [
     'Health Center Services',
@@ -65,25 +69,47 @@ const AppointmentBookingForm = ({ onClose, preselectedService }) => {
     }
   };
 
-  const loadAvailableSlots = async (date, service) => {
+  // Fetch the whole bookable window for a service once; later date changes are answered locally
+  const loadAvailability = async (service, cached = availability) => {
+    if (cached.service === service) {
+      return cached;
+    }
+    const response = await fetch(
+      `${API_BASE_URL}/appointments/availability?from=${getMinDate()}&to=${getMaxDate()}&service=${encodeURIComponent(service)}`
+    );
+    if (!response.ok) {
+      throw new Error('Failed to load availability');
+    }
+    const data = await response.json();
+    const loaded = {
+      service,
+      slotTimes: data.slotTimes,
+      days: Object.fromEntries(data.days.map(day => [day.date, day]))
+    };
+    setAvailability(loaded);
+    return loaded;
+  };
+
+  // Pass NO_AVAILABILITY as cached to skip the stored window (state updates land after this call)
+  const loadAvailableSlots = async (date, service, cached = availability) => {
     setLoadingSlots(true);
     try {
-      const response = await fetch(
-        `${API_BASE_URL}/appointments/available-slots?date=${date}&service=${encodeURIComponent(service)}`
-      );
-      const data = await response.json();
-      
+      const { slotTimes, days } = await loadAvailability(mapServiceName(service), cached);
+      const fullSlots = days[date] ? days[date].fullSlots : [];
+
       // Convert time format from 24hr to 12hr for display
-      const formattedSlots = data.availableSlots.map(slot => {
-        const [hours, minutes] = slot.split(':');
-        const hour = parseInt(hours);
-        const ampm = hour >= 12 ? 'PM' : 'AM';
-        const displayHour = hour === 0 ? 12 : hour > 12 ? hour - 12 : hour;
-        return {
-          value: slot,
-          display: `${displayHour}:${minutes} ${ampm}`
-        };
-      });
+      const formattedSlots = slotTimes
+        .filter(slot => !fullSlots.includes(slot))
+        .map(slot => {
+          const [hours, minutes] = slot.split(':');
+          const hour = parseInt(hours);
+          const ampm = hour >= 12 ? 'PM' : 'AM';
+          const displayHour = hour === 0 ? 12 : hour > 12 ? hour - 12 : hour;
+          return {
+            value: slot,
+            display: `${displayHour}:${minutes} ${ampm}`
+          };
+        });
       setAvailableSlots(formattedSlots);
     } catch (error) {
       console.error('Error loading slots:', error);
@@ -112,6 +138,15 @@ const AppointmentBookingForm = ({ onClose, preselectedService }) => {
         body: JSON.stringify(submissionData),
       });
 
+      // The stored window no longer matches the server: the slot was just booked, or refused as full
+      setAvailability(NO_AVAILABILITY);
+
+      if (response.status === 409) {
+        setSubmitStatus('slot-taken');
+        setFormData(prev => ({ ...prev, time: '' }));
+        loadAvailableSlots(formData.date, formData.serviceType, NO_AVAILABILITY);
+        return;
+      }
       if (!response.ok) {
         throw new Error('Failed to book appointment');
       }
@@ -328,6 +363,13 @@ const AppointmentBookingForm = ({ onClose, preselectedService }) => {
             </div>
           )}
 
+          {submitStatus === 'slot-taken' && (
+            <div className="alert alert-error">
+              <AlertCircle size={20} />
+              <span>That time slot has just been fully booked. Please choose another time.</span>
+            </div>
+          )}
+
           {submitStatus === 'error' && (
             <div className="alert alert-error">
               <AlertCircle size={20} />
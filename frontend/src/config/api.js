@@ -73,6 +73,9 @@ export const appointmentAPI = {
   
   getAvailableSlots: (date, service) => 
     apiCall(`/appointments/available-slots?date=${date}&service=${encodeURIComponent(service)}`),
+
+  getAvailability: (from, to, service) =>
+    apiCall(`/appointments/availability?from=${from}&to=${to}&service=${encodeURIComponent(service)}`),
 };
 
 export const newsAPI = {
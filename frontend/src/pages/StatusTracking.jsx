@@ -17,10 +17,11 @@ const StatusTracking = () => {
 
     try {
       let data;
+      const id = trackingId.trim().toUpperCase();
       if (trackingType === 'certificate') {
-        data = await certificateAPI.track(trackingId);
+        data = await certificateAPI.track(id);
       } else {
-        data = await appointmentAPI.track(trackingId);
+        data = await appointmentAPI.track(id);
       }
       
       setResult(data);